@@ -0,0 +1,45 @@
+-- Batch insert for sauna_news with server-side deduplication
+-- Run this migration in your Supabase SQL Editor after 003_sauna_news_table.sql
+
+-- Function: Insert a batch of news items in one round-trip
+-- Rows whose content_hash already exists are skipped (ON CONFLICT DO NOTHING).
+-- Returns how many rows were inserted and the hashes that were skipped.
+CREATE OR REPLACE FUNCTION upsert_news_items(items JSONB)
+RETURNS TABLE (
+    inserted_count INT,
+    skipped_hashes TEXT[]
+) AS $$
+    WITH incoming AS (
+        SELECT *
+        FROM jsonb_to_recordset(items) AS x(
+            title TEXT,
+            summary TEXT,
+            source_url TEXT,
+            published_at TIMESTAMP WITH TIME ZONE,
+            news_type news_type,
+            venue_name TEXT,
+            is_featured BOOLEAN,
+            content_hash TEXT
+        )
+    ),
+    inserted AS (
+        INSERT INTO sauna_news (
+            title, summary, source_url, published_at,
+            news_type, venue_name, is_featured, content_hash
+        )
+        SELECT
+            title, summary, source_url, published_at,
+            COALESCE(news_type, 'other'), venue_name, COALESCE(is_featured, FALSE), content_hash
+        FROM incoming
+        ON CONFLICT (content_hash) DO NOTHING
+        RETURNING content_hash
+    )
+    SELECT
+        (SELECT COUNT(*)::INT FROM inserted),
+        ARRAY(
+            SELECT i.content_hash FROM incoming i
+            WHERE i.content_hash NOT IN (SELECT content_hash FROM inserted)
+        );
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION upsert_news_items IS 'Batch-inserts sauna_news rows, skipping existing content_hash values; returns inserted count and skipped hashes';
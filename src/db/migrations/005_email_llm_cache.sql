@@ -0,0 +1,19 @@
+-- Cache of Gemini compress + classify results, keyed by email content
+-- Run this migration in your Supabase SQL Editor after 004_upsert_news_items.sql
+
+-- Table: email_llm_cache
+-- Templated newsletters and reprocessed emails hash to the same key, so their
+-- digest is reused instead of calling Gemini again
+CREATE TABLE IF NOT EXISTS email_llm_cache (
+    content_hash TEXT PRIMARY KEY,
+    compressed TEXT NOT NULL,
+    summary TEXT,
+    is_sauna_related BOOLEAN NOT NULL DEFAULT FALSE,
+    confidence FLOAT,
+    gemini_model TEXT,
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+);
+
+-- Comments for documentation
+COMMENT ON TABLE email_llm_cache IS 'Gemini compression + sauna-relevance results reused across identical emails';
+COMMENT ON COLUMN email_llm_cache.content_hash IS 'SHA-256 of subject + cleaned body (URLs and addresses stripped)';
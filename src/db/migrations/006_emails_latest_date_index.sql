@@ -0,0 +1,8 @@
+-- Index for the incremental Gmail fetch watermark
+-- Run this migration in your Supabase SQL Editor after 005_email_llm_cache.sql
+
+-- get_latest_email_date runs: WHERE date IS NOT NULL ORDER BY date DESC LIMIT 1
+-- idx_emails_date (001) sorts NULL dates first under DESC, so rows without a
+-- Date header would have to be skipped; this partial index excludes them and
+-- answers the query with a single index tip read.
+CREATE INDEX IF NOT EXISTS idx_emails_date_not_null ON emails(date DESC) WHERE date IS NOT NULL;
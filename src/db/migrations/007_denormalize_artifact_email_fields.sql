@@ -0,0 +1,65 @@
+-- Copy email date/sender/subject onto email_artifacts
+-- Run this migration in your Supabase SQL Editor after 006_emails_latest_date_index.sql
+
+-- Artifacts are one-per-email, so carrying these three columns lets artifact
+-- queries filter and sort on a single table instead of embedding emails!inner
+ALTER TABLE email_artifacts
+    ADD COLUMN IF NOT EXISTS email_date TIMESTAMP WITHOUT TIME ZONE,
+    ADD COLUMN IF NOT EXISTS sender TEXT,
+    ADD COLUMN IF NOT EXISTS subject TEXT;
+
+-- Backfill existing artifacts from their email
+UPDATE email_artifacts ea
+SET email_date = e.date,
+    sender = e.sender,
+    subject = e.subject
+FROM emails e
+WHERE ea.email_id = e.id;
+
+-- Covers: is_sauna_related = TRUE AND confidence_score >= x AND email_date >= cutoff
+CREATE INDEX IF NOT EXISTS idx_email_artifacts_relevant_date
+    ON email_artifacts(is_sauna_related, confidence_score, email_date DESC);
+
+-- Function: Get unused email artifacts (now without the emails join)
+CREATE OR REPLACE FUNCTION get_unused_email_artifacts(
+    min_confidence FLOAT DEFAULT 0.5,
+    days_back INT DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    email_id UUID,
+    compressed_content TEXT,
+    summary TEXT,
+    confidence_score FLOAT,
+    processed_at TIMESTAMP,
+    sender TEXT,
+    subject TEXT,
+    email_date TIMESTAMP
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        ea.id,
+        ea.email_id,
+        ea.compressed_content,
+        ea.summary,
+        ea.confidence_score,
+        ea.processed_at,
+        ea.sender,
+        ea.subject,
+        ea.email_date
+    FROM email_artifacts ea
+    LEFT JOIN newsletter_artifacts na ON ea.id = na.artifact_id
+    WHERE
+        ea.is_sauna_related = TRUE
+        AND ea.confidence_score >= min_confidence
+        AND na.artifact_id IS NULL  -- Not used in any newsletter
+        AND (days_back IS NULL OR ea.email_date >= NOW() - INTERVAL '1 day' * days_back)  -- Optional date filter
+    ORDER BY ea.confidence_score DESC, ea.email_date DESC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Comments for documentation
+COMMENT ON COLUMN email_artifacts.email_date IS 'Copy of emails.date (when the email was sent)';
+COMMENT ON COLUMN email_artifacts.sender IS 'Copy of emails.sender';
+COMMENT ON COLUMN email_artifacts.subject IS 'Copy of emails.subject';
@@ -43,6 +43,9 @@ LIKELY_KEYWORDS = re.compile(
     re.I,
 )
 
+# Stop sniffing once no XHR/fetch has fired for this long (after one last scroll nudge)
+IDLE_SECONDS = 2.0
+
 
 @dataclass
 class Captured:
@@ -83,9 +86,11 @@ def sniff(out_path: Path, seconds: int = 20) -> None:
     user_data_dir = Path(".pw-profile")
     user_data_dir.mkdir(exist_ok=True)
 
-    captured_reqs: List[Captured] = []
+    # Keyed by (METHOD, url): repeated polling XHRs collapse into one entry as they arrive
+    captured_by_key: Dict[Tuple[str, str], Captured] = {}
     console_logs: List[Dict[str, Any]] = []
     page_errors: List[str] = []
+    last_xhr_ts = time.monotonic()
 
     with sync_playwright() as p:
         context = p.chromium.launch_persistent_context(
@@ -116,26 +121,29 @@ def sniff(out_path: Path, seconds: int = 20) -> None:
         page.on("pageerror", lambda err: page_errors.append(str(err)))
 
         def on_request(req):
+            nonlocal last_xhr_ts
             rt = req.resource_type
             if rt in {"xhr", "fetch"}:
-                captured_reqs.append(Captured(url=req.url, method=req.method, resource_type=rt))
+                last_xhr_ts = time.monotonic()
+                key = (req.method.upper(), req.url)
+                if key not in captured_by_key:
+                    captured_by_key[key] = Captured(url=req.url, method=req.method, resource_type=rt)
 
         def on_response(resp):
             req = resp.request
             rt = req.resource_type
             if rt not in {"xhr", "fetch"}:
                 return
-            # Add status + content-type to the most recent matching request entry
+            c = captured_by_key.get((req.method.upper(), req.url))
+            if c is None:
+                return
+            # Add status + content-type to the matching request entry
             try:
                 ct = resp.headers.get("content-type")
             except Exception:
                 ct = None
-            # find last matching URL+method (cheap + good enough)
-            for i in range(len(captured_reqs) - 1, -1, -1):
-                if captured_reqs[i].url == req.url and captured_reqs[i].method == req.method:
-                    captured_reqs[i].status = resp.status
-                    captured_reqs[i].content_type = ct
-                    break
+            c.status = resp.status
+            c.content_type = ct
 
         page.on("request", on_request)
         page.on("response", on_response)
@@ -153,30 +161,28 @@ def sniff(out_path: Path, seconds: int = 20) -> None:
             except Exception:
                 pass
 
-        # Nudge lazy-loaders
-        for i in range(seconds):
-            time.sleep(1)
-            if i in {2, 5, 8, 12, 16}:
-                try:
-                    page.mouse.wheel(0, 900)
-                except Exception:
-                    pass
+        # Pump Playwright events until the network goes quiet, nudging lazy-loaders
+        # with a scroll whenever it does. Give up after a nudge that triggers nothing.
+        deadline = time.monotonic() + seconds
+        last_xhr_ts = time.monotonic()
+        nudged = False
+        while time.monotonic() < deadline:
+            page.wait_for_timeout(500)
+            if time.monotonic() - last_xhr_ts < IDLE_SECONDS:
+                nudged = False
+                continue
+            if nudged:
+                break
+            try:
+                page.mouse.wheel(0, 900)
+            except Exception:
+                pass
+            nudged = True
+            last_xhr_ts = time.monotonic()
 
         context.close()
 
-    # De-dupe
-    uniq = {}
-    for c in captured_reqs:
-        key = (c.method.upper(), c.url)
-        # Keep the richest version (with status/ct)
-        prev = uniq.get(key)
-        if prev is None:
-            uniq[key] = c
-        else:
-            if (prev.status is None and c.status is not None) or (prev.content_type is None and c.content_type is not None):
-                uniq[key] = c
-
-    uniq_list = list(uniq.values())
+    uniq_list = list(captured_by_key.values())
 
     # Rank likely endpoints
     ranked: List[Tuple[int, Captured]] = []
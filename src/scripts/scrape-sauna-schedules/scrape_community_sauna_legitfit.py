@@ -4,7 +4,7 @@ Scrape Community Sauna booking "API" via LegitFit timetables.
 
 What it does:
 - Pulls Community Sauna location pages
-- Extracts LegitFit timetable IDs
+- Extracts LegitFit timetable IDs (cached on disk for 24h; --refresh-discovery to bypass)
 - Fetches LegitFit timetable HTML for a date range
 - Parses sessions into structured JSON
 
@@ -20,14 +20,26 @@ import dataclasses
 import json
 import re
 import sys
+import time
 from datetime import date, timedelta
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401  (C-backed parser for BeautifulSoup)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
 
 LEGITFIT_TIMETABLE_RE = re.compile(r"https://legitfit\.com/p/timetable/([a-f0-9]{24})", re.I)
+UK_POSTCODE_RE = re.compile(r"\b[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}\b")
+
+# Lowercased availability lines, matched exactly
+AVAILABILITY_LABELS = frozenset({"sold out", "join waitlist", "bookings closed"})
 
 DEFAULT_LOCATION_PAGES = [
     "https://www.community-sauna.co.uk/locations/camberwell#booking",
@@ -43,6 +55,9 @@ FALLBACK_SLUGS = {
 }
 
 
+DISCOVERY_CACHE_PATH = Path(".lf_discover.json")
+DISCOVERY_TTL_S = 24 * 60 * 60
+
 UA = "sauna-newsletter-bot/1.0 (+https://example.com; contact: you@example.com)"
 
 
@@ -67,11 +82,37 @@ def http_get(url: str, timeout_s: int = 30) -> str:
     return r.text
 
 
-def discover_legitfit_timetable_ids(location_pages: List[str]) -> Dict[str, List[str]]:
+def _load_discovery_cache(path: Path) -> Dict[str, Any]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def discover_legitfit_timetable_ids(
+    location_pages: List[str],
+    cache_path: Optional[Path] = DISCOVERY_CACHE_PATH,
+    refresh: bool = False,
+) -> Dict[str, List[str]]:
+    """
+    Timetable IDs are effectively static, so IDs found on each location page are
+    memoized on disk for DISCOVERY_TTL_S. Pass cache_path=None to disable.
+    """
+    cache = _load_discovery_cache(cache_path) if cache_path and not refresh else {}
+    now = time.time()
+    cache_dirty = False
+
     out: Dict[str, List[str]] = {}
     for lp in location_pages:
-        html = http_get(lp)
-        ids = sorted(set(LEGITFIT_TIMETABLE_RE.findall(html)))
+        entry = cache.get(lp)
+        if isinstance(entry, dict) and now - entry.get("fetched_at", 0) < DISCOVERY_TTL_S:
+            ids = list(entry.get("ids") or [])
+        else:
+            html = http_get(lp)
+            ids = sorted(set(LEGITFIT_TIMETABLE_RE.findall(html)))
+            cache[lp] = {"fetched_at": now, "ids": ids}
+            cache_dirty = True
 
         if not ids:
             low = lp.lower()
@@ -81,12 +122,18 @@ def discover_legitfit_timetable_ids(location_pages: List[str]) -> Dict[str, List
                     break
 
         out[lp] = ids
+
+    if cache_path and cache_dirty:
+        try:
+            cache_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: could not write discovery cache {cache_path}: {e}", file=sys.stderr)
     return out
 
 
-def build_timetable_url(timetable_id: str, day: date) -> str:
-    # Observed pattern supports /<YYYY-MM-DD> with ?isIframe=true
-    return f"https://legitfit.com/p/timetable/{timetable_id}/{day.isoformat()}?isIframe=true"
+def timetable_base_url(timetable_id: str) -> str:
+    # Observed pattern supports <base>/<YYYY-MM-DD> with ?isIframe=true
+    return f"https://legitfit.com/p/timetable/{timetable_id}"
 
 
 def parse_duration_min(s: str) -> Optional[int]:
@@ -126,18 +173,19 @@ def parse_legitfit_timetable(html: str, day: date, source_url: str) -> List[Sess
 
     This is resilient-ish without depending on brittle CSS classes.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     text = soup.get_text("\n")
     lines = [ln.strip() for ln in text.splitlines()]
     lines = [ln for ln in lines if ln]  # drop empties
+    lines_lc = [ln.lower() for ln in lines]
 
     sessions: List[Session] = []
     location_name: str = "Unknown location"
 
     # First “location name” we see often appears as a standalone line near top
     # e.g. "Community Sauna Camberwell"
-    for ln in lines[:80]:
-        if ln.lower().startswith("community sauna"):
+    for ln, ln_lc in zip(lines[:80], lines_lc):
+        if ln_lc.startswith("community sauna"):
             location_name = ln
             break
 
@@ -170,18 +218,19 @@ def parse_legitfit_timetable(html: str, day: date, source_url: str) -> List[Sess
             # Heuristics: within next ~12 lines after the time header
             for j in range(i + 1, min(i + 13, len(lines))):
                 candidate = lines[j]
+                candidate_lc = lines_lc[j]
 
                 # availability signals
-                if candidate.lower() in {"sold out", "join waitlist", "bookings closed"}:
+                if candidate_lc in AVAILABILITY_LABELS:
                     availability = candidate
 
-                # address-ish: contains "UK" or looks like London postcode
-                if (" UK" in candidate) or re.search(r"\b[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}\b", candidate):
+                # address-ish: contains "UK" or looks like London postcode (>= 5 chars)
+                if (" UK" in candidate) or (len(candidate) >= 5 and UK_POSTCODE_RE.search(candidate)):
                     # Avoid catching random marketing lines with postcodes; still good enough
                     address = candidate
 
                 # price-ish: contains £ or "drop-in"
-                if "£" in candidate or "drop-in" in candidate.lower():
+                if "£" in candidate or "drop-in" in candidate_lc:
                     price_text = candidate
 
             sessions.append(
@@ -215,12 +264,19 @@ def main() -> int:
         default=DEFAULT_LOCATION_PAGES,
         help="Community Sauna location page URLs (defaults to known ones)",
     )
+    ap.add_argument(
+        "--refresh-discovery",
+        action="store_true",
+        help="Ignore the cached timetable IDs and re-fetch the location pages",
+    )
     args = ap.parse_args()
 
-    discovered = discover_legitfit_timetable_ids(args.locations)
+    discovered = discover_legitfit_timetable_ids(args.locations, refresh=args.refresh_discovery)
 
     today = date.today()
     end_day = today + timedelta(days=args.days - 1)
+    days = [today + timedelta(days=i) for i in range(args.days)]
+    day_isos = [d.isoformat() for d in days]
 
     all_sessions: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
@@ -232,9 +288,9 @@ def main() -> int:
 
         # Some pages may contain multiple; scrape them all
         for tid in timetable_ids:
-            d = today
-            while d <= end_day:
-                url = build_timetable_url(tid, d)
+            base = timetable_base_url(tid)
+            for d, d_iso in zip(days, day_isos):
+                url = f"{base}/{d_iso}?isIframe=true"
                 try:
                     html = http_get(url)
                     sessions = parse_legitfit_timetable(html, d, url)
@@ -242,9 +298,8 @@ def main() -> int:
                         all_sessions.append(dataclasses.asdict(s))
                 except Exception as e:
                     errors.append(
-                        {"location_page": loc_page, "timetable_id": tid, "date": d.isoformat(), "url": url, "error": str(e)}
+                        {"location_page": loc_page, "timetable_id": tid, "date": d_iso, "url": url, "error": str(e)}
                     )
-                d += timedelta(days=1)
 
     payload = {
         "scraped_at": date.today().isoformat(),
@@ -11,7 +11,11 @@ Example:
 
 Notes:
 - Uses the readonly-api endpoint you provided.
-- Paginates until it runs out of results.
+- Paginates until it runs out of results. If the response envelope reports a
+  total, the exact page count is computed up front and the remaining pages are
+  fetched concurrently (with --sleep 0; otherwise one at a time, paced).
+- --http2 switches to an httpx HTTP/2 client so concurrent pages multiplex
+  over one connection (requires `pip install 'httpx[http2]'`).
 - Saves a single JSON file with metadata + all sessions.
 """
 
@@ -19,15 +23,27 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 
 DEFAULT_SESSION_TYPES = [
@@ -38,6 +54,25 @@ DEFAULT_SESSION_TYPES = [
     "special-event-new",
 ]
 
+# Headers: look like a normal browser client
+BROWSER_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Origin": "https://momence.com",
+    "Referer": "https://momence.com/",
+}
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.http_retry import request_with_retry, status_retry
+
 
 @dataclass
 class FetchConfig:
@@ -48,43 +83,32 @@ class FetchConfig:
     timeout_s: float
     sleep_s: float
     max_pages: Optional[int]
+    workers: int = 4
+    http2: bool = False
+
 
+def build_session(http2: bool = False) -> Any:
+    if http2:
+        if httpx is None:
+            raise RuntimeError("--http2 requires httpx. Install: pip install 'httpx[http2]'")
+        return httpx.Client(
+            headers=BROWSER_HEADERS,
+            transport=httpx.HTTPTransport(http2=True, retries=3),
+        )
 
-def build_session() -> requests.Session:
     s = requests.Session()
 
     # Reasonable retry policy for flaky networks / transient 5xx
-    retry = Retry(
-        total=6,
-        connect=6,
-        read=6,
-        backoff_factor=0.6,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=status_retry())
     s.mount("https://", adapter)
     s.mount("http://", adapter)
 
-    # Headers: look like a normal browser client
-    s.headers.update(
-        {
-            "Accept": "application/json, text/plain, */*",
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Origin": "https://momence.com",
-            "Referer": "https://momence.com/",
-        }
-    )
+    s.headers.update(BROWSER_HEADERS)
     return s
 
 
 def fetch_page(
-    session: requests.Session,
+    session: Any,
     cfg: FetchConfig,
     page: int,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
@@ -105,13 +129,14 @@ def fetch_page(
         ]
     )
 
-    r = session.get(url, params=params, timeout=cfg.timeout_s)
+    r = request_with_retry(session, "GET", url, params=params, timeout=cfg.timeout_s)
     if r.status_code >= 400:
         # Include body excerpt for debugging
         excerpt = (r.text or "")[:500]
         raise RuntimeError(f"HTTP {r.status_code} fetching page={page}. Body: {excerpt}")
 
-    data = r.json()
+    # orjson decodes the raw bytes directly; fall back to stdlib json if unavailable
+    data = orjson.loads(r.content) if orjson is not None else r.json()
 
     # Common shapes: either list directly, or {data: [...]}, or {sessions: [...]}, or {payload: [...]} etc.
     items: Optional[List[Dict[str, Any]]] = None
@@ -134,12 +159,33 @@ def fetch_page(
     return items, data
 
 
+def total_pages(raw: Any, page_size: int) -> Optional[int]:
+    """
+    Exact page count from the response envelope, if the API reports a total
+    (e.g. {"totalCount": 123} or {"pagination": {"total": 123}}). None otherwise.
+    """
+    if not isinstance(raw, dict) or page_size <= 0:
+        return None
+
+    candidates = [raw.get("totalCount"), raw.get("total")]
+    pagination = raw.get("pagination")
+    if isinstance(pagination, dict):
+        candidates.extend([pagination.get("totalCount"), pagination.get("total")])
+
+    for total in candidates:
+        if isinstance(total, int) and not isinstance(total, bool) and total >= 0:
+            return math.ceil(total / page_size)
+    return None
+
+
 def scrape_all(cfg: FetchConfig) -> Dict[str, Any]:
-    session = build_session()
+    session = build_session(http2=cfg.http2)
     all_items: List[Dict[str, Any]] = []
     pages_fetched = 0
     page = 0
 
+    num_pages: Optional[int] = None
+
     while True:
         if cfg.max_pages is not None and page >= cfg.max_pages:
             break
@@ -152,6 +198,12 @@ def scrape_all(cfg: FetchConfig) -> Dict[str, Any]:
 
         all_items.extend(items)
 
+        # Prefer the exact page count from the envelope over the page_size heuristic
+        if page == 0:
+            num_pages = total_pages(raw, cfg.page_size)
+            if num_pages is not None:
+                break
+
         # Heuristic: if we got fewer than page_size, likely last page
         if len(items) < cfg.page_size:
             break
@@ -160,6 +212,24 @@ def scrape_all(cfg: FetchConfig) -> Dict[str, Any]:
         if cfg.sleep_s > 0:
             time.sleep(cfg.sleep_s)
 
+    if num_pages is not None:
+        if cfg.max_pages is not None:
+            num_pages = min(num_pages, cfg.max_pages)
+        remaining = range(1, num_pages)
+
+        if cfg.sleep_s > 0:
+            # Paced: one page at a time, sleeping between requests
+            for page in remaining:
+                time.sleep(cfg.sleep_s)
+                items, _ = fetch_page(session, cfg, page)
+                pages_fetched += 1
+                all_items.extend(items)
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, cfg.workers)) as pool:
+                for items, _ in pool.map(lambda p: fetch_page(session, cfg, p), remaining):
+                    pages_fetched += 1
+                    all_items.extend(items)
+
     return {
         "scraped_at": datetime.now(timezone.utc).isoformat(),
         "host_id": cfg.host_id,
@@ -193,7 +263,8 @@ def parse_args() -> argparse.Namespace:
         "--sleep",
         type=float,
         default=0.2,
-        help="Sleep between pages (seconds). Helps avoid 429s.",
+        help="Sleep between pages (seconds). Helps avoid 429s. Pages are fetched "
+        "one at a time unless this is 0.",
     )
     p.add_argument(
         "--max-pages",
@@ -201,6 +272,17 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional cap for pages (useful for testing).",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent page fetches when the API reports a total and --sleep is 0 (default: 4).",
+    )
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use an httpx HTTP/2 client (multiplexes concurrent page fetches).",
+    )
     p.add_argument("--out", required=True, help="Output JSON path.")
     return p.parse_args()
 
@@ -217,6 +299,8 @@ def main() -> int:
         timeout_s=args.timeout,
         sleep_s=args.sleep,
         max_pages=args.max_pages,
+        workers=args.workers,
+        http2=args.http2,
     )
 
     try:
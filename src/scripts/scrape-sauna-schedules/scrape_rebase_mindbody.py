@@ -6,9 +6,9 @@ This endpoint returns JavaScript (JSONP-ish). The cb(...) argument is often an
 object where quotes are escaped (e.g. {\"class_sessions\":\"\\u003cdiv...\"}),
 so we:
   1) unwrap cb(...)
-  2) unescape once (unicode_escape)
-  3) json.loads
-  4) read markup from known keys (incl. class_sessions)
+  2) json-decode directly (orjson when installed); only if that fails,
+     unescape once (\\uXXXX, \\", ...) and decode again
+  3) read markup from known keys (incl. class_sessions)
 
 Then we do a minimal parse from the returned markup to produce instances.
 """
@@ -16,17 +16,31 @@ Then we do a minimal parse from the returned markup to produce instances.
 from __future__ import annotations
 
 import argparse
-import codecs
 import json
 import os
 import re
-from dataclasses import dataclass, asdict
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
 import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.json_output import write_json
 
 
 WIDGET_SCHEDULE_ID = 211646
@@ -41,21 +55,33 @@ UA = (
 
 CALLBACK_WRAPPER_RE = re.compile(r"^[^(]+\((.*)\)\s*;?\s*$", re.DOTALL)
 
-# Keys Mindbody widgets commonly use for markup chunks
+# Keys Mindbody widgets commonly use for markup chunks (hot key first)
 MARKUP_KEYS = (
+    "class_sessions",   # <-- the one your response uses
     "markup",
     "html",
     "content",
     "body",
     "response",
-    "class_sessions",   # <-- the one your response uses
     "sessions",
 )
 
-URL_RE = re.compile(r"https?://[^\s\"'>]+")
+# The only escapes Mindbody emits: \uXXXX plus JSON/JS single-char escapes
+ESCAPE_RE = re.compile(r"\\u([0-9a-fA-F]{4})|\\([\"'\\/bfnrt])")
+SIMPLE_ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f",
+    '"': '"', "'": "'", "\\": "\\", "/": "/",
+}
+
+# URLs in markup that mention a booking/API-ish keyword (filtered by the regex engine)
+DEEP_URL_RE = re.compile(
+    r"https?://[^\s\"'>]*(?:mindbody|healcode|api|class|schedule|booking|appointment)[^\s\"'>]*",
+    re.I,
+)
+VISIBLE_TIME_RE = re.compile(r"\b\d{1,2}:\d{2}\s*(AM|PM)\b", re.I)
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInstance:
     title: str
     start: str
@@ -67,6 +93,10 @@ class ClassInstance:
     source_url: str
 
 
+# ClassInstance is flat (str/None only), so a field-name loop replaces asdict's deep copy
+CLASS_INSTANCE_FIELDS = tuple(f.name for f in fields(ClassInstance))
+
+
 def http_get(session: requests.Session, url: str) -> requests.Response:
     r = session.get(
         url,
@@ -85,8 +115,36 @@ def _unicode_unescape_once(s: str) -> str:
     """
     Turn sequences like \\u003c into <, and \\\" into ".
     This matches the encoding style visible in your error preview.
+
+    A single regex pass instead of the general unicode_escape codec, which also
+    mangles non-ASCII text (it round-trips through latin-1).
     """
-    return codecs.decode(s, "unicode_escape")
+    def repl(m: re.Match) -> str:
+        if m.group(1):
+            return chr(int(m.group(1), 16))
+        return SIMPLE_ESCAPES[m.group(2)]
+
+    return ESCAPE_RE.sub(repl, s)
+
+
+def _json_loads(s: str) -> Any:
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+
+def _unescape(s: str) -> str:
+    """
+    Unescape once. Escaped-JSON payloads are valid JSON string bodies, so let the
+    JSON decoder (orjson's C path when installed) do it by wrapping s in quotes.
+    Fall back to the regex pass when s has bare quotes/control chars or JS-only
+    escapes like \\'.
+    """
+    try:
+        out = _json_loads(f'"{s}"')
+        if isinstance(out, str):
+            return out
+    except Exception:
+        pass
+    return _unicode_unescape_once(s)
 
 
 def _extract_cb_arg(js: str) -> str:
@@ -100,16 +158,23 @@ def _parse_js_object_payload(js_inner: str) -> Any:
     The cb(...) argument is *sometimes* valid JSON; often it is a JSON-like string
     with escaped quotes. We try both.
     """
-    # First try direct JSON
+    # First try direct JSON. A quoted cb("...") argument decodes to a string here,
+    # which is itself JSON when it wraps an object: parse it once more.
     try:
-        return json.loads(js_inner)
+        payload = _json_loads(js_inner)
+        if isinstance(payload, str) and payload.lstrip().startswith(("{", "[")):
+            try:
+                return _json_loads(payload)
+            except Exception:
+                pass
+        return payload
     except Exception:
         pass
 
     # If it contains lots of \" or \uXXXX, unescape once then try JSON again.
     try:
-        unescaped = _unicode_unescape_once(js_inner)
-        return json.loads(unescaped)
+        unescaped = _unescape(js_inner)
+        return _json_loads(unescaped)
     except Exception:
         pass
 
@@ -119,8 +184,8 @@ def _parse_js_object_payload(js_inner: str) -> Any:
         try:
             # strip quotes, unescape, parse
             inner_str = js_inner[1:-1]
-            inner_unescaped = _unicode_unescape_once(inner_str)
-            return json.loads(inner_unescaped)
+            inner_unescaped = _unescape(inner_str)
+            return _json_loads(inner_unescaped)
         except Exception:
             pass
 
@@ -128,6 +193,20 @@ def _parse_js_object_payload(js_inner: str) -> Any:
     raise RuntimeError(f"Could not parse JS payload as JSON. First 800 chars: {preview}")
 
 
+def _find_markup(d: Dict[str, Any], depth: int = 1) -> Optional[str]:
+    for k in MARKUP_KEYS:
+        v = d.get(k)
+        if isinstance(v, str) and v.strip():
+            return v
+    if depth > 0:
+        for v in d.values():
+            if isinstance(v, dict):
+                markup = _find_markup(v, depth - 1)
+                if markup is not None:
+                    return markup
+    return None
+
+
 def fetch_markup(session: requests.Session, start_day: date) -> str:
     params = {
         "callback": "cb",
@@ -142,20 +221,11 @@ def fetch_markup(session: requests.Session, start_day: date) -> str:
 
     payload = _parse_js_object_payload(js_inner)
 
-    # payload might be a dict containing the markup
+    # payload might be a dict containing the markup (sometimes nested once)
     if isinstance(payload, dict):
-        for k in MARKUP_KEYS:
-            v = payload.get(k)
-            if isinstance(v, str) and v.strip():
-                return v
-
-        # Sometimes nested once
-        for v in payload.values():
-            if isinstance(v, dict):
-                for k in MARKUP_KEYS:
-                    vv = v.get(k)
-                    if isinstance(vv, str) and vv.strip():
-                        return vv
+        markup = _find_markup(payload)
+        if markup is not None:
+            return markup
 
     # Rare case: payload is directly a string of markup
     if isinstance(payload, str) and payload.strip():
@@ -164,13 +234,16 @@ def fetch_markup(session: requests.Session, start_day: date) -> str:
     raise RuntimeError(f"Could not find markup in payload. Keys: {list(payload.keys()) if isinstance(payload, dict) else type(payload)}")
 
 
+def fetch_markup_safe(session: requests.Session, day: date) -> Tuple[date, Optional[str], Optional[str]]:
+    """Thread-pool friendly wrapper: returns (day, markup, error) instead of raising."""
+    try:
+        return day, fetch_markup(session, day), None
+    except Exception as e:
+        return day, None, str(e)
+
+
 def discover_deeper_urls(markup_html: str) -> List[str]:
-    urls = set()
-    for m in URL_RE.finditer(markup_html):
-        u = m.group(0)
-        if any(k in u.lower() for k in ("mindbody", "healcode", "api", "class", "schedule", "booking", "appointment")):
-            urls.add(u)
-    return sorted(urls)
+    return sorted(set(DEEP_URL_RE.findall(markup_html)))
 
 
 def parse_instances_from_markup(markup_html: str, source_day: date, source_url: str) -> List[ClassInstance]:
@@ -179,42 +252,55 @@ def parse_instances_from_markup(markup_html: str, source_day: date, source_url:
       <div class="bw-session" ... data-bw-widget-mbo-class-id="21582" data-bw-widget-mbo-class-name="member_s_suite" ...>
     and there is usually a visible time element inside.
     """
-    soup = BeautifulSoup(markup_html, "html.parser")
+    # Days without classes often come back with no session markup at all: skip the parse
+    if "bw-session" not in markup_html:
+        return []
+
+    tree = LexborHTMLParser(markup_html)
 
     instances: List[ClassInstance] = []
 
     # Mindbody widgets usually include sessions as div.bw-session
-    for sess in soup.select(".bw-session"):
+    for sess in tree.css(".bw-session"):
+        attrs = sess.attributes
+
         # Skip empty day placeholders
-        classes = sess.get("class") or []
+        classes = (attrs.get("class") or "").split()
         if "bw-session--empty" in classes:
             continue
 
         title = (
-            sess.get("data-bw-widget-mbo-class-name")
-            or sess.get("data-bw-widget-class-name")
-            or sess.get("data-bw-widget-title")
+            attrs.get("data-bw-widget-mbo-class-name")
+            or attrs.get("data-bw-widget-class-name")
+            or attrs.get("data-bw-widget-title")
         )
 
         # Find a visible time if present
-        # Common: .bw-session__time or similar
-        time_el = sess.select_one(".bw-session__time") or sess.find(string=re.compile(r"\b\d{1,2}:\d{2}\s*(AM|PM)\b", re.I))
+        # Common: .bw-session__time, else the first text node that looks like a time
         start = ""
-        if time_el:
-            start = time_el.get_text(" ", strip=True) if hasattr(time_el, "get_text") else str(time_el).strip()
+        time_el = sess.css_first(".bw-session__time")
+        if time_el is not None:
+            start = time_el.text(separator=" ", strip=True)
+        else:
+            for node in sess.traverse(include_text=True):
+                if node.tag == "-text":
+                    txt = node.text(deep=False)
+                    if VISIBLE_TIME_RE.search(txt):
+                        start = txt.strip()
+                        break
 
         # Signup link if present
         signup_url = None
-        a = sess.find("a", href=True)
-        if a:
-            href = a["href"]
+        a = sess.css_first("a[href]")
+        if a is not None:
+            href = a.attributes.get("href") or ""
             signup_url = f"{BASE}{href}" if href.startswith("/") else href
 
         # If we couldn't find title from attributes, try visible heading
         if not title:
-            t = sess.find(["strong", "b", "h3", "h4", "h5"])
-            if t:
-                title = t.get_text(" ", strip=True)
+            t = sess.css_first("strong, b, h3, h4, h5")
+            if t is not None:
+                title = t.text(separator=" ", strip=True)
         if not title:
             title = "unknown"
 
@@ -231,17 +317,12 @@ def parse_instances_from_markup(markup_html: str, source_day: date, source_url:
             )
         )
 
-    # Dedup by (title, start, signup_url)
-    seen = set()
-    uniq: List[ClassInstance] = []
+    # Dedup by (title, start, signup_url); dicts keep first-seen order
+    uniq: Dict[tuple, ClassInstance] = {}
     for x in instances:
-        key = (x.title, x.start, x.signup_url)
-        if key in seen:
-            continue
-        seen.add(key)
-        uniq.append(x)
+        uniq.setdefault((x.title, x.start, x.signup_url), x)
 
-    return uniq
+    return list(uniq.values())
 
 
 def main() -> None:
@@ -255,6 +336,7 @@ def main() -> None:
         default=None,
         help="Optional directory to save raw markup per day for debugging",
     )
+    ap.add_argument("--workers", type=int, default=6, help="Concurrent day fetches (default: 6)")
     args = ap.parse_args()
 
     start_day = date.fromisoformat(args.start) if args.start else date.today()
@@ -266,17 +348,23 @@ def main() -> None:
     all_discovered_urls: List[str] = []
     errors: List[Dict[str, Any]] = []
 
-    d = start_day
-    while d <= end_day:
+    # Days are independent: fetch concurrently (network-bound), then parse sequentially
+    days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        fetched = list(pool.map(lambda day: fetch_markup_safe(session, day), days))
+
+    for d, markup, err in fetched:
+        if err is not None:
+            errors.append({"date": d.isoformat(), "error": err})
+            continue
         try:
             # Stable source url (no cachebuster) for traceability
             source_url = f"{LOAD_MARKUP}?{urlencode({'callback': 'cb', 'options[start_date]': d.isoformat()})}"
 
-            markup = fetch_markup(session, d)
-
             if args.dump_markup_dir:
                 os.makedirs(args.dump_markup_dir, exist_ok=True)
-                with open(os.path.join(args.dump_markup_dir, f"{d.isoformat()}.html"), "w", encoding="utf-8") as f:
+                dump_path = os.path.join(args.dump_markup_dir, f"{d.isoformat()}.html")
+                with open(dump_path, "w", encoding="utf-8") as f:
                     f.write(markup)
 
             all_discovered_urls.extend(discover_deeper_urls(markup))
@@ -285,8 +373,6 @@ def main() -> None:
         except Exception as e:
             errors.append({"date": d.isoformat(), "error": str(e)})
 
-        d += timedelta(days=1)
-
     all_discovered_urls = sorted(set(all_discovered_urls))
 
     payload = {
@@ -294,7 +380,7 @@ def main() -> None:
         "widget_schedule_id": WIDGET_SCHEDULE_ID,
         "date_range": {"start": start_day.isoformat(), "end": end_day.isoformat()},
         "instance_count": len(all_instances),
-        "instances": [asdict(x) for x in all_instances],
+        "instances": [{n: getattr(x, n) for n in CLASS_INSTANCE_FIELDS} for x in all_instances],
         "discovered_urls_in_markup": all_discovered_urls,
         "errors": errors,
         "note": (
@@ -303,8 +389,7 @@ def main() -> None:
         ),
     }
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    write_json(args.out, payload)
 
     print(f"Wrote {args.out} (instances={len(all_instances)}, errors={len(errors)})")
 
@@ -3,6 +3,7 @@
 Sniff JSON/XHR endpoints used by RooftopSaunas booking flow, then optionally replay.
 - No HTML parsing required.
 - Uses Playwright to click into booking and records XHR/fetch JSON responses.
+- Images, fonts, stylesheets, media and analytics are blocked during sniffing.
 """
 
 from __future__ import annotations
@@ -15,7 +16,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-from playwright.sync_api import sync_playwright, Page, Response
+from playwright.sync_api import sync_playwright, Page, Response, Route
 
 
 JSON_CT_RE = re.compile(r"application/(json|problem\+json)|text/json", re.I)
@@ -26,6 +27,11 @@ KEYWORDS = (
     "session", "sessions", "inventory"
 )
 
+ANALYTICS_HOSTS = ("google-analytics", "googletagmanager", "hotjar", "doubleclick")
+
+# Subresources that never carry booking XHRs; aborting them speeds up networkidle
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+
 @dataclass(frozen=True)
 class Captured:
     url: str
@@ -48,7 +54,7 @@ def is_interesting(resp: Response) -> bool:
 
         # Filter out obvious analytics noise
         host = urlparse(url).netloc.lower()
-        if any(x in host for x in ("google-analytics", "googletagmanager", "hotjar", "doubleclick", "stripe.com")):
+        if any(x in host for x in ANALYTICS_HOSTS + ("stripe.com",)):
             return False
 
         # Prefer “booking-ish” URLs
@@ -64,6 +70,17 @@ def is_interesting(resp: Response) -> bool:
     except Exception:
         return False
 
+def block_heavy_resources(route: Route) -> None:
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+        return
+    host = urlparse(req.url).netloc.lower()
+    if any(x in host for x in ANALYTICS_HOSTS):
+        route.abort()
+        return
+    route.continue_()
+
 def click_booking_entrypoints(page: Page) -> None:
     """
     Try a few common entrypoints. Non-fatal if not found.
@@ -111,7 +128,8 @@ def sniff(url: str, out: str, headless: bool = True, timeout_ms: int = 30000) ->
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=headless)
-        ctx = browser.new_context()
+        ctx = browser.new_context(bypass_csp=True)
+        ctx.route("**/*", block_heavy_resources)
         page = ctx.new_page()
         page.on("response", on_response)
 
@@ -120,11 +138,7 @@ def sniff(url: str, out: str, headless: bool = True, timeout_ms: int = 30000) ->
         # Try to enter booking flow (may open a new tab/window)
         click_booking_entrypoints(page)
 
-        # If it opened a popup, attach to it and wait there too.
-        # (Playwright exposes popups via page.expect_popup, but this is “best effort”.)
-        page.wait_for_timeout(4000)
-
-        # Also wait for network to settle after clicks/redirects
+        # Wait for network to settle after clicks/redirects
         try:
             page.wait_for_load_state("networkidle", timeout=timeout_ms)
         except Exception:
@@ -13,20 +13,36 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup, Tag
 
+try:
+    import lxml  # noqa: F401  (C-backed parser for BeautifulSoup)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.json_output import write_json
+
 
 URL = "https://www.saunasocialclub.co.uk/whats-on"
 TZ = dt.timezone.utc
 
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "Mozilla/5.0 (sauna-newsletter-scraper)"})
+
 MONTHS = {
     "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
     "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12
@@ -47,11 +63,14 @@ EVENT_RE = re.compile(
 )
 
 
+@lru_cache(maxsize=4096)
 def infer_date(month: int, day: int, weekday_idx: int, today: dt.date) -> Optional[dt.date]:
     """
     Infer the real calendar date by matching weekday.
     Searches nearby years and chooses the date closest to today,
     with a bias toward future dates.
+
+    Pure function of hashable args, so repeated (month, day, weekday) rows are cached.
     """
     candidates = []
     for year in [today.year - 1, today.year, today.year + 1, today.year + 2]:
@@ -72,16 +91,12 @@ def infer_date(month: int, day: int, weekday_idx: int, today: dt.date) -> Option
         future_penalty = 0 if delta_days >= -7 else 1
         return (future_penalty, abs(delta_days))
 
-    return sorted(candidates, key=score)[0]
+    return min(candidates, key=score)
 
 
 def fetch_html(url: str) -> str:
     """Fetch HTML from URL."""
-    r = requests.get(
-        url,
-        timeout=30,
-        headers={"User-Agent": "Mozilla/5.0 (sauna-newsletter-scraper)"}
-    )
+    r = SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.text
 
@@ -93,24 +108,22 @@ def scrape_whats_on(url: str = URL) -> List[Dict]:
     Returns list of event dictionaries.
     """
     html = fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
 
-    # Gather block-level text elements in document order
-    lines: List[Tag] = []
-    for el in soup.find_all(["h1", "h2", "h3", "p", "li"]):
-        txt = el.get_text(" ", strip=True)
-        if txt:
-            lines.append(el)
+    # Gather block-level text elements in document order, extracting text once
+    lines: List[Tuple[Tag, str]] = [
+        (el, txt)
+        for el in soup.find_all(["h1", "h2", "h3", "p", "li"])
+        if (txt := el.get_text(" ", strip=True))
+    ]
 
     today = dt.datetime.now(TZ).date()
     current_month: Optional[str] = None
     events: List[Dict] = []
 
-    for el in lines:
-        text = el.get_text(" ", strip=True)
-
+    for el, text in lines:
         # Check if this is a month header
-        low = text.strip().lower()
+        low = text.lower()
         if low in MONTHS:
             current_month = low
             continue
@@ -119,6 +132,10 @@ def scrape_whats_on(url: str = URL) -> List[Dict]:
         if not current_month:
             continue
 
+        # Cheap prefilter: every event line has a "|" separator
+        if "|" not in text:
+            continue
+
         # Try to match event pattern: "Thu 23 | Event Name"
         m = EVENT_RE.match(text)
         if not m:
@@ -179,8 +196,7 @@ def main() -> int:
         args.out.parent.mkdir(parents=True, exist_ok=True)
 
         # Write output
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        write_json(args.out, events)
 
         print(f"✓ Scraped {len(events)} events", file=sys.stderr)
         print(f"✓ Output written to: {args.out}", file=sys.stderr)
@@ -12,84 +12,141 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+try:
+    from lxml import html as lxml_html  # C-backed parser (also used by BeautifulSoup)
+    HTML_PARSER = "lxml"
+except ImportError:
+    lxml_html = None
+    HTML_PARSER = "html.parser"
+
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.json_output import write_json
 
 
 BASE = "https://www.sweheatsauna.co.uk"
 LIST_URL = f"{BASE}/events"
 
 HEADERS = {
-    "User-Agent": "Mozilla/5.0 (compatible; sauna-newsletter-scraper/1.0)"
+    "User-Agent": "Mozilla/5.0 (compatible; sauna-newsletter-scraper/1.0)",
+    "Connection": "keep-alive",
 }
 
+# One keep-alive session so each event page reuses the pooled TCP/TLS connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 EVENT_PATH_RE = re.compile(r"^/events/[^?#]+$")
 
+# Date/time heuristics used by parse_event_page
+# One pass per line; m.lastgroup names the token. A ", 14 March 2026" tail is
+# its own token because it consumes the year (it implies both year and range).
+LINE_TOKENS_RE = re.compile(
+    r"(?P<weekday>\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)(?:day)?\b)"
+    r"|(?P<dated>,\s*\d{1,2}\s+\w+\s+20\d{2})"
+    r"|(?P<year>\b20\d{2}\b)"
+    r"|(?P<time>\b\d{1,2}:\d{2}\b)"
+    r"|(?P<to>\bto\b)"
+)
+TIME_PAIR_RE = re.compile(r"\d{1,2}:\d{2}\s+\d{1,2}:\d{2}")
+DATE_WINDOW_LINES = 40
+
+# Description collection: stop at the footer marker, skip navigation links
+DESCRIPTION_END_MARKER = "location."
+NAVIGATION_TEXTS = frozenset({"back to all events"})
+
 
 def fetch(url: str) -> str:
     """Fetch HTML from URL."""
-    r = requests.get(url, headers=HEADERS, timeout=30)
+    r = SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.text
 
 
 def extract_event_urls(list_html: str) -> List[str]:
     """Extract event URLs from the events list page."""
-    soup = BeautifulSoup(list_html, "html.parser")
-    urls = set()
+    if lxml_html is not None:
+        # Only hrefs are needed: pull them straight out with XPath, no soup tree
+        hrefs = lxml_html.fromstring(list_html).xpath("//a/@href") if list_html.strip() else []
+    else:
+        soup = BeautifulSoup(list_html, HTML_PARSER)
+        hrefs = [a["href"] for a in soup.find_all("a", href=True)]
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        if EVENT_PATH_RE.match(href):
-            urls.add(urljoin(BASE, href))
+    return sorted({urljoin(BASE, h.strip()) for h in hrefs if EVENT_PATH_RE.match(h.strip())})
+
+
+def text_lines_after(node: Tag, limit: int) -> List[str]:
+    """
+    Non-empty, stripped text lines following `node` in document order (or all of
+    the document's lines if `node` is the soup), stopping after `limit` lines.
+    Avoids materialising the whole page's text just to slice a small window.
+    """
+    if isinstance(node, BeautifulSoup):
+        strings = node.descendants
+    else:
+        own = {id(d) for d in node.descendants}
+        strings = (el for el in node.next_elements if id(el) not in own)
 
-    return sorted(urls)
+    lines: List[str] = []
+    for el in strings:
+        # Plain text only, matching get_text() (skips comments, script, style)
+        if type(el) is not NavigableString:
+            continue
+        for ln in el.splitlines():
+            ln = ln.strip()
+            if ln:
+                lines.append(ln)
+                if len(lines) >= limit:
+                    return lines
+    return lines
 
 
 def parse_event_page(event_url: str, html: str) -> Dict[str, Any]:
     """Parse a single event page and extract structured data."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     # Title
     h1 = soup.find("h1")
     title = h1.get_text(" ", strip=True) if h1 else None
 
-    # Extract text for date/time parsing
-    text = soup.get_text("\n", strip=True)
+    # Extract text for date/time parsing: only the lines right after the title
     date_line = None
     time_line = None
     range_line = None
 
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-
-    # Find date/time after title
-    if title and title in lines:
-        start_idx = lines.index(title) + 1
-    else:
-        start_idx = 0
-
-    window = lines[start_idx:start_idx + 40]
+    window = text_lines_after(h1 if h1 else soup, DATE_WINDOW_LINES)
 
     # Heuristics for date/time extraction
     for ln in window:
+        seen = {m.lastgroup for m in LINE_TOKENS_RE.finditer(ln)}
+
         # Look for date patterns
-        if re.search(r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)(?:day)?\b", ln) and re.search(r"\b20\d{2}\b", ln):
+        if "weekday" in seen and ("year" in seen or "dated" in seen):
             # Multi-day range or single day?
-            if re.search(r"\b\d{1,2}:\d{2}\b", ln) and re.search(r"\bto\b|,\s*\d{1,2}\s+\w+\s+20\d{2}", ln):
+            if "time" in seen and ("to" in seen or "dated" in seen):
                 range_line = ln
             else:
                 date_line = ln
         # Look for time range (e.g., "18:00 20:00")
-        if re.fullmatch(r"\d{1,2}:\d{2}\s+\d{1,2}:\d{2}", ln):
+        if TIME_PAIR_RE.fullmatch(ln):
             time_line = ln
         if date_line and time_line:
             break
@@ -108,22 +165,17 @@ def parse_event_page(event_url: str, html: str) -> Dict[str, Any]:
             book_url = abs_url
 
     # Description: collect paragraphs until we hit "Location." (footer marker)
+    # Avoid duplicating title/date/time
+    already_used = {t for t in (title, date_line, time_line) if t}
     desc_parts = []
     for p in soup.find_all(["p", "li", "h2", "h3"]):
         t = p.get_text(" ", strip=True)
-        if not t:
+        if not t or t in already_used:
             continue
-        if t.strip().lower() == "location.":
+        low = t.lower()
+        if low == DESCRIPTION_END_MARKER:
             break
-        # Skip navigation
-        if t.strip().lower() in {"back to all events"}:
-            continue
-        # Avoid duplicating title/date/time
-        if title and t == title:
-            continue
-        if date_line and t == date_line:
-            continue
-        if time_line and t == time_line:
+        if low in NAVIGATION_TEXTS:
             continue
         desc_parts.append(t)
 
@@ -142,7 +194,14 @@ def parse_event_page(event_url: str, html: str) -> Dict[str, Any]:
     }
 
 
-def scrape_swesauna() -> List[Dict[str, Any]]:
+def fetch_polite(url: str) -> str:
+    """Fetch an event page, then pause so each worker stays polite."""
+    html = fetch(url)
+    time.sleep(0.7)
+    return html
+
+
+def scrape_swesauna(workers: int = 4) -> List[Dict[str, Any]]:
     """Scrape all events from SweSauna."""
     list_html = fetch(LIST_URL)
     event_urls = extract_event_urls(list_html)
@@ -150,16 +209,13 @@ def scrape_swesauna() -> List[Dict[str, Any]]:
     print(f"Found {len(event_urls)} event URLs", file=sys.stderr)
 
     events = []
-    for i, url in enumerate(event_urls, 1):
-        html = fetch(url)
-        event = parse_event_page(url, html)
-        events.append(event)
+    # Fetch pages concurrently (network-bound); parse in order on this thread
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for i, (url, html) in enumerate(zip(event_urls, pool.map(fetch_polite, event_urls)), 1):
+            events.append(parse_event_page(url, html))
 
-        # Be polite
-        time.sleep(0.7)
-
-        if i % 10 == 0:
-            print(f"Fetched {i}/{len(event_urls)}", file=sys.stderr)
+            if i % 10 == 0:
+                print(f"Fetched {i}/{len(event_urls)}", file=sys.stderr)
 
     return events
 
@@ -174,18 +230,23 @@ def main() -> int:
         required=True,
         help="Output JSON file path"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent event page fetches (default: 4)"
+    )
 
     args = parser.parse_args()
 
     try:
-        events = scrape_swesauna()
+        events = scrape_swesauna(workers=args.workers)
 
         # Ensure output directory exists
         args.out.parent.mkdir(parents=True, exist_ok=True)
 
         # Write output
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        write_json(args.out, events)
 
         print(f"✓ Scraped {len(events)} events", file=sys.stderr)
         print(f"✓ Output written to: {args.out}", file=sys.stderr)
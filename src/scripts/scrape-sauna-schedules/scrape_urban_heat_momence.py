@@ -6,20 +6,39 @@ Scrapes sauna sessions from Urban Heat Wellness using the Momence API.
 
 Usage:
     python scrape_urban_heat_momence.py --out urban_heat_events.json
+    python scrape_urban_heat_momence.py --out urban_heat_events.json --http2
+
+--http2 switches to an httpx HTTP/2 client so the prefetched pages multiplex
+over one connection (requires `pip install 'httpx[http2]'`).
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.http_retry import request_with_retry, status_retry
+from src.utils.json_output import write_json_array
+
+log = logging.getLogger(__name__)
 
 
 HOST_ID = "130322"  # Urban Heat Wellness
@@ -33,45 +52,67 @@ DEFAULT_SESSION_TYPES = [
     "special-event-new",
 ]
 
+# Pages fetched speculatively per round; extra requests past the end just come back empty
+PREFETCH_WINDOW = 4
+
+API_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "User-Agent": "Mozilla/5.0 (sauna-newsletter-scraper)",
+    "Origin": "https://www.urbanheatwellness.com",
+    "Referer": "https://www.urbanheatwellness.com/",
+}
+
+def build_session(http2: bool = False) -> Any:
+    """Create a requests session with retry logic, or an HTTP/2 httpx client."""
+    if http2:
+        if httpx is None:
+            raise RuntimeError("--http2 requires httpx. Install: pip install 'httpx[http2]'")
+        return httpx.Client(
+            headers=API_HEADERS,
+            transport=httpx.HTTPTransport(http2=True, retries=3),
+        )
 
-def build_session() -> requests.Session:
-    """Create a requests session with retry logic."""
     s = requests.Session()
 
-    retry = Retry(
-        total=6,
-        connect=6,
-        read=6,
-        backoff_factor=0.6,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
+    # Pool sized for the concurrent page prefetch in fetch_events
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=status_retry())
     s.mount("https://", adapter)
     s.mount("http://", adapter)
 
-    s.headers.update(
-        {
-            "Accept": "application/json, text/plain, */*",
-            "User-Agent": "Mozilla/5.0 (sauna-newsletter-scraper)",
-            "Origin": "https://www.urbanheatwellness.com",
-            "Referer": "https://www.urbanheatwellness.com/",
-        }
-    )
+    s.headers.update(API_HEADERS)
     return s
 
 
-def fetch_events(
-    session: requests.Session,
+def fetch_page(
+    session: Any,
+    url: str,
+    params: Dict[str, Any],
+    page: int,
+) -> Dict[str, Any]:
+    """Fetch one page of Momence sessions."""
+    response = request_with_retry(session, "GET", url, params={**params, "page": str(page)}, timeout=30)
+
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"HTTP {response.status_code} fetching page {page}: {response.text[:200]}"
+        )
+
+    return response.json()
+
+
+def iter_event_pages(
+    session: Any,
     host_id: str,
     teacher_id: str,
     from_date: str,
     page_size: int = 50,
     session_types: List[str] = None,
-) -> List[Dict[str, Any]]:
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Fetch events from Urban Heat Wellness Momence API.
+    Yield each page of events from the Urban Heat Wellness Momence API, in order.
+
+    Pages are prefetched in windows of PREFETCH_WINDOW, so while the caller
+    processes one page the next ones are already downloading.
 
     Args:
         session: Requests session
@@ -81,61 +122,72 @@ def fetch_events(
         page_size: Number of events per page
         session_types: List of session types to include
 
-    Returns:
-        List of event dictionaries
+    Yields:
+        Lists of event dictionaries, one per non-empty page
     """
     if session_types is None:
         session_types = DEFAULT_SESSION_TYPES
 
     url = f"https://readonly-api.momence.com/host-plugins/host/{host_id}/host-schedule/sessions"
 
+    # Built once; fetch_page only swaps in the page number. A list value is
+    # sent as repeated sessionTypes[]=... query args.
     params = {
         "teacherIds[]": teacher_id,
         "fromDate": from_date,
         "pageSize": str(page_size),
-        "page": "0",
+        "sessionTypes[]": list(session_types),
     }
 
-    # Add session types
-    for st in session_types:
-        params[f"sessionTypes[]"] = st
-
-    all_events = []
     page = 0
 
-    while True:
-        params["page"] = str(page)
-        response = session.get(url, params=params, timeout=30)
+    # Fetch pages in windows of PREFETCH_WINDOW; stop at the first empty / last page
+    with ThreadPoolExecutor(max_workers=PREFETCH_WINDOW) as pool:
+        while True:
+            window = range(page, page + PREFETCH_WINDOW)
+
+            for data in pool.map(lambda p: fetch_page(session, url, params, p), window):
+                events = data.get("payload", [])
+                if not events:
+                    return
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"HTTP {response.status_code} fetching page {page}: {response.text[:200]}"
-            )
+                yield events
 
-        data = response.json()
-        events = data.get("payload", [])
+                # Check if there are more pages
+                pagination = data.get("pagination", {})
+                if not pagination.get("hasMoreItems", False):
+                    return
 
-        if not events:
-            break
+            page += PREFETCH_WINDOW
 
-        all_events.extend(events)
 
-        # Check if there are more pages
-        pagination = data.get("pagination", {})
-        if not pagination.get("hasMoreItems", False):
-            break
+def fetch_events(
+    session: Any,
+    host_id: str,
+    teacher_id: str,
+    from_date: str,
+    page_size: int = 50,
+    session_types: List[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all events from Urban Heat Wellness Momence API.
 
-        page += 1
+    Same arguments as iter_event_pages.
 
-    return all_events
+    Returns:
+        List of event dictionaries
+    """
+    pages = iter_event_pages(session, host_id, teacher_id, from_date, page_size, session_types)
+    return [event for page in pages for event in page]
 
 
-def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+def normalize_event(event: Dict[str, Any], keep_raw: bool = False) -> Dict[str, Any]:
     """
     Normalize Momence event data.
 
     Args:
         event: Raw Momence event object
+        keep_raw: Also embed the untouched API object under "raw"
 
     Returns:
         Normalized event dictionary
@@ -153,7 +205,7 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
     sold = event.get("ticketsSold", 0)
     spots_available = capacity - sold if capacity else None
 
-    return {
+    normalized = {
         "source": "urban_heat_momence",
         "session_id": event.get("id"),
         "session_name": event.get("sessionName"),
@@ -170,8 +222,10 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
         "teacher_id": event.get("teacherId"),
         "booking_url": event.get("link"),
         "status": event.get("status"),
-        "raw": event,
     }
+    if keep_raw:
+        normalized["raw"] = event
+    return normalized
 
 
 def main() -> int:
@@ -196,42 +250,64 @@ def main() -> int:
         default=TEACHER_ID,
         help=f"Momence teacher ID (default: {TEACHER_ID})"
     )
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="Include the raw API object for each event (roughly doubles output size)"
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use an httpx HTTP/2 client (multiplexes prefetched page fetches)"
+    )
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.INFO,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
     try:
         # Generate from_date (current time in UTC)
-        from_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        from_date = (
+            datetime.now(timezone.utc)
+            .replace(microsecond=0)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
 
         # Fetch events
-        print(f"Fetching events for host {args.host_id}...", file=sys.stderr)
-        session = build_session()
-        raw_events = fetch_events(
+        log.info("Fetching events for host %s...", args.host_id)
+        session = build_session(http2=args.http2)
+        pages = iter_event_pages(
             session,
             args.host_id,
             args.teacher_id,
             from_date,
         )
 
-        # Normalize events
-        events = [normalize_event(e) for e in raw_events]
-
         # Ensure output directory exists
         args.out.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write output
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        # Normalize and write each page as it arrives, while later pages are
+        # still downloading; the normalized list is never held in full
+        events = (
+            normalize_event(e, keep_raw=args.keep_raw)
+            for page in pages
+            for e in page
+        )
+        count = write_json_array(args.out, events)
 
-        print(f"✓ Scraped {len(events)} events", file=sys.stderr)
-        print(f"✓ Output written to: {args.out}", file=sys.stderr)
+        log.info("✓ Scraped %d events", count)
+        log.info("✓ Output written to: %s", args.out)
 
         return 0
 
     except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        log.exception("Scrape failed: %s", e)
         return 1
 
 
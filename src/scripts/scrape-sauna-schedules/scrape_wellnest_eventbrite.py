@@ -8,6 +8,10 @@ using the Eventbrite API.
 Usage:
     export EVENTBRITE_TOKEN="your_token_here"
     python scrape_wellnest_eventbrite.py --out wellnest_events.json
+    python scrape_wellnest_eventbrite.py --out wellnest_events.json --http2
+
+--http2 switches to an httpx HTTP/2 client so the concurrent page fetches
+multiplex over one connection (requires `pip install 'httpx[http2]'`).
 
 Note: Requires EVENTBRITE_TOKEN environment variable.
 """
@@ -15,54 +19,169 @@ Note: Requires EVENTBRITE_TOKEN environment variable.
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Add project root to path (for src.utils)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.http_retry import request_with_retry, status_retry
+from src.utils.json_output import write_json_array
+
+log = logging.getLogger(__name__)
 
 
 ORGANIZER_ID = "113455047681"  # WellNest London
 API_BASE = "https://www.eventbriteapi.com/v3"
 
+# Validators + bodies of previously fetched pages, for conditional re-fetches
+ETAG_CACHE_PATH = Path(".eventbrite_etags.json.gz")
+
+# Address fields joined (in order) into venue_address
+VENUE_ADDRESS_KEYS = ("address_1", "city", "postal_code")
+
+# Cap on concurrent page requests (stays well under Eventbrite's rate limit)
+MAX_CONCURRENT_PAGES = 8
+
+def build_session(token: str, http2: bool = False) -> Any:
+    """Create a keep-alive session (or HTTP/2 httpx client) with retry logic and auth attached."""
+    if http2:
+        if httpx is None:
+            raise RuntimeError("--http2 requires httpx. Install: pip install 'httpx[http2]'")
+        return httpx.Client(
+            headers={"Authorization": f"Bearer {token}"},
+            transport=httpx.HTTPTransport(http2=True, retries=3),
+        )
 
-def fetch_events(token: str, organizer_id: str) -> List[Dict[str, Any]]:
+    s = requests.Session()
+
+    # Pool sized for the concurrent page fetches in fetch_events
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_PAGES, max_retries=status_retry())
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+
+    s.headers.update({"Authorization": f"Bearer {token}"})
+    return s
+
+
+def load_etag_cache(path: Path) -> Dict[str, Any]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_etag_cache(path: Path, cache: Dict[str, Any]) -> None:
+    try:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        log.warning("Could not write ETag cache %s: %s", path, e)
+
+
+def fetch_page(
+    session: Any,
+    url: str,
+    params: Dict[str, Any],
+    page: int,
+    cache: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch one page of an Eventbrite list endpoint.
+
+    With a cache dict, the request is made conditional on the ETag /
+    Last-Modified seen last time, and a 304 reuses the stored body. Fresh
+    responses that carry a validator are written back into the cache.
+    """
+    key = f"{url}|{page}"
+    entry = cache.get(key) if cache is not None else None
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = request_with_retry(
+        session, "GET", url, params={**params, "page": page}, headers=headers, timeout=30
+    )
+    if response.status_code == 304 and entry:
+        return entry["body"]
+
+    # Transient 429/5xx were already retried by the session; anything left is fatal
+    response.raise_for_status()
+    data = response.json()
+
+    if cache is not None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            cache[key] = {"etag": etag, "last_modified": last_modified, "body": data}
+    return data
+
+
+def fetch_events(
+    session: Any,
+    organizer_id: str,
+    cache: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     """
     Fetch all live events for an Eventbrite organizer.
 
     Args:
-        token: Eventbrite API token
+        session: Requests session carrying the Eventbrite auth header (see build_session)
         organizer_id: Eventbrite organizer ID
+        cache: Optional ETag cache (see fetch_page), updated in place
 
     Returns:
         List of event dictionaries
     """
     url = f"{API_BASE}/organizers/{organizer_id}/events/"
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
     params = {
         "status": "live",
         "expand": "venue",  # Include venue details
     }
 
-    all_events = []
-    page = 1
+    # Page 1 tells us page_count; the rest can then be fetched concurrently
+    data = fetch_page(session, url, params, 1, cache)
+    all_events = list(data.get("events", []))
+    pagination = data.get("pagination", {})
 
-    while True:
-        params["page"] = page
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+    if not all_events or not pagination.get("has_more_items", False):
+        return all_events
 
-        if response.status_code != 200:
-            error_msg = response.json().get("error_description", "Unknown error")
-            raise RuntimeError(
-                f"Eventbrite API error (status {response.status_code}): {error_msg}"
-            )
+    page_count = pagination.get("page_count")
+    if isinstance(page_count, int) and page_count > 1:
+        pages = range(2, page_count + 1)
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PAGES, len(pages))) as pool:
+            for data in pool.map(lambda p: fetch_page(session, url, params, p, cache), pages):
+                all_events.extend(data.get("events", []))
+        return all_events
 
-        data = response.json()
+    # No page_count reported: walk the remaining pages in order
+    page = 2
+    while True:
+        data = fetch_page(session, url, params, page, cache)
         events = data.get("events", [])
 
         if not events:
@@ -80,12 +199,13 @@ def fetch_events(token: str, organizer_id: str) -> List[Dict[str, Any]]:
     return all_events
 
 
-def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+def normalize_event(event: Dict[str, Any], keep_raw: bool = False) -> Dict[str, Any]:
     """
     Normalize Eventbrite event data to our schema.
 
     Args:
         event: Raw Eventbrite event object
+        keep_raw: Also embed the untouched API object under "raw"
 
     Returns:
         Normalized event dictionary
@@ -98,8 +218,8 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
         title = str(name)
 
     # Extract start/end times
-    start_obj = event.get("start", {})
-    end_obj = event.get("end", {})
+    start_obj = event.get("start") or {}
+    end_obj = event.get("end") or {}
     start_dt = start_obj.get("local") or start_obj.get("utc")
     end_dt = end_obj.get("local") or end_obj.get("utc")
 
@@ -110,22 +230,15 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
         date_str = start_dt[:10] if len(start_dt) >= 10 else None
 
     # Extract venue
-    venue_obj = event.get("venue", {})
-    venue_name = venue_obj.get("name") if venue_obj else None
-    venue_address = None
-    if venue_obj and venue_obj.get("address"):
-        addr = venue_obj["address"]
-        parts = []
-        if addr.get("address_1"):
-            parts.append(addr["address_1"])
-        if addr.get("city"):
-            parts.append(addr["city"])
-        if addr.get("postal_code"):
-            parts.append(addr["postal_code"])
-        venue_address = ", ".join(parts) if parts else None
+    venue_obj = event.get("venue") or {}
+    venue_name = venue_obj.get("name")
+    addr = venue_obj.get("address") or {}
+    venue_address = ", ".join(
+        part for part in (addr.get(k) for k in VENUE_ADDRESS_KEYS) if part
+    ) or None
 
     # Extract description
-    description = event.get("description", {})
+    description = event.get("description") or {}
     if isinstance(description, dict):
         description_text = description.get("text")
     else:
@@ -138,7 +251,7 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
     # Extract capacity
     capacity = event.get("capacity")
 
-    return {
+    normalized = {
         "source": "wellnest_eventbrite",
         "event_id": event.get("id"),
         "title": title,
@@ -153,8 +266,10 @@ def normalize_event(event: Dict[str, Any]) -> Dict[str, Any]:
         "price": price,
         "capacity": capacity,
         "status": event.get("status"),
-        "raw": event,
     }
+    if keep_raw:
+        normalized["raw"] = event
+    return normalized
 
 
 def main() -> int:
@@ -179,43 +294,63 @@ def main() -> int:
         default=ORGANIZER_ID,
         help=f"Eventbrite organizer ID (default: {ORGANIZER_ID})"
     )
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="Include the raw API object for each event (roughly doubles output size)"
+    )
+    parser.add_argument(
+        "--no-etag-cache",
+        action="store_true",
+        help=f"Always re-download every page (ignore and don't update {ETAG_CACHE_PATH})"
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use an httpx HTTP/2 client (multiplexes concurrent page fetches)"
+    )
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.INFO,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
     # Get token from args or environment
     token = args.token or os.getenv("EVENTBRITE_TOKEN")
     if not token:
-        print(
-            "Error: EVENTBRITE_TOKEN not set. "
-            "Either set the environment variable or use --token",
-            file=sys.stderr
+        log.error(
+            "EVENTBRITE_TOKEN not set. "
+            "Either set the environment variable or use --token"
         )
         return 1
 
     try:
         # Fetch events
-        print(f"Fetching events for organizer {args.organizer_id}...", file=sys.stderr)
-        raw_events = fetch_events(token, args.organizer_id)
-
-        # Normalize events
-        events = [normalize_event(e) for e in raw_events]
+        log.info("Fetching events for organizer %s...", args.organizer_id)
+        session = build_session(token, http2=args.http2)
+        cache = None if args.no_etag_cache else load_etag_cache(ETAG_CACHE_PATH)
+        raw_events = fetch_events(session, args.organizer_id, cache)
+        if cache:
+            save_etag_cache(ETAG_CACHE_PATH, cache)
 
         # Ensure output directory exists
         args.out.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write output
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        # Normalize lazily while writing, so the normalized list is never held in full
+        events = (normalize_event(e, keep_raw=args.keep_raw) for e in raw_events)
+        count = write_json_array(args.out, events)
 
-        print(f"✓ Scraped {len(events)} events", file=sys.stderr)
-        print(f"✓ Output written to: {args.out}", file=sys.stderr)
+        log.info("✓ Scraped %d events", count)
+        log.info("✓ Output written to: %s", args.out)
 
         return 0
 
     except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        log.exception("Scrape failed: %s", e)
         return 1
 
 
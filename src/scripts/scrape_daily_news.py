@@ -13,18 +13,22 @@ Usage:
     python src/scripts/scrape_daily_news.py --dry-run      # Test without saving
 """
 
+import io
 import os
 import sys
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # Add src to path and load .env from project root
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 # Load .env file from project root
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
@@ -32,7 +36,7 @@ load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
 from src.services.perplexity_service import PerplexityService
 from src.services.gemini_service import GeminiService
 from src.services.supabase_service import SupabaseService, NewsItem
-from src.models.types import SearchQuery, PerplexityResult
+from src.models.types import SearchQuery, SearchTheme, PerplexityResult
 
 
 class ExtractedNewsItem(BaseModel):
@@ -53,60 +57,66 @@ class NewsExtractionOutput(BaseModel):
     news_items: List[ExtractedNewsItem] = Field(description="List of extracted news items")
 
 
+# Stored news from this many days back is listed in the Gemini prompt as already covered
+RECENT_NEWS_DAYS = 14
+RECENT_NEWS_PROMPT_LIMIT = 30
+
+# Focus on hard news only (no deals, no events): (query, context) pairs
+NEWS_THEMES = (
+    (
+        "new sauna opening announcement London",
+        "Looking for announcements of new sauna venues opening in London in the past 24-48 hours",
+    ),
+    (
+        "sauna closure shutdown London",
+        "Looking for news about sauna venues closing or shutting down in London",
+    ),
+    (
+        "sauna expansion new location London",
+        "Looking for news about existing sauna brands expanding to new locations in London",
+    ),
+    (
+        "major sauna news London announcement",
+        "Looking for significant sauna industry news, policy changes, or major announcements in London",
+    ),
+    (
+        "London wellness sauna industry news",
+        "Looking for broader wellness industry news related to saunas in London",
+    ),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_daily_news_queries(recency_filter: str) -> Tuple[SearchQuery, ...]:
+    # Using "EVENTS" theme as a generic placeholder since these are news queries
+    return tuple(
+        SearchQuery(
+            query=query_text,
+            theme=SearchTheme.EVENTS,  # Using EVENTS as generic theme for news
+            context=context,
+        )
+        for query_text, context in NEWS_THEMES
+    )
+
+
 def create_daily_news_queries(recency_filter: str = "day") -> List[SearchQuery]:
     """
     Create focused news queries for daily scraping.
 
+    The SearchQuery objects are built once per recency filter and reused.
+
     Args:
         recency_filter: Perplexity recency filter ("day", "week", or "month")
 
     Returns:
         List of SearchQuery objects
     """
-    from src.models.types import SearchTheme
-
-    queries = []
-
-    # Focus on hard news only (no deals, no events)
-    # Using "EVENTS" theme as a generic placeholder since these are news queries
-    news_themes = [
-        (
-            "new sauna opening announcement London",
-            "Looking for announcements of new sauna venues opening in London in the past 24-48 hours",
-        ),
-        (
-            "sauna closure shutdown London",
-            "Looking for news about sauna venues closing or shutting down in London",
-        ),
-        (
-            "sauna expansion new location London",
-            "Looking for news about existing sauna brands expanding to new locations in London",
-        ),
-        (
-            "major sauna news London announcement",
-            "Looking for significant sauna industry news, policy changes, or major announcements in London",
-        ),
-        (
-            "London wellness sauna industry news",
-            "Looking for broader wellness industry news related to saunas in London",
-        ),
-    ]
-
-    for query_text, context in news_themes:
-        queries.append(
-            SearchQuery(
-                query=query_text,
-                theme=SearchTheme.EVENTS,  # Using EVENTS as generic theme for news
-                context=context,
-            )
-        )
-
-    return queries
+    return list(_build_daily_news_queries(recency_filter))
 
 
 def deduplicate_with_gemini(
     perplexity_results: List[PerplexityResult],
-    existing_hashes: List[str],
+    recent_titles: Sequence[str],
     gemini_service: GeminiService,
 ) -> List[ExtractedNewsItem]:
     """
@@ -114,12 +124,18 @@ def deduplicate_with_gemini(
 
     Args:
         perplexity_results: Raw results from Perplexity
-        existing_hashes: List of content hashes already in database
+        recent_titles: Titles of news items already stored in the past
+            RECENT_NEWS_DAYS days
         gemini_service: Gemini service instance
 
     Returns:
         List of extracted and deduplicated news items
     """
+    # Nothing to extract from (all searches failed or came back empty);
+    # don't pay for a Gemini call
+    if not any(r.answer.strip() for r in perplexity_results):
+        return []
+
     # Build the prompt
     system_prompt = """You are a news extraction specialist for a London sauna newsletter.
 
@@ -156,20 +172,26 @@ DEDUPLICATION:
 OUTPUT:
 Return 3-7 high-quality, FACTUALLY ACCURATE news items. If unsure about accuracy, reduce relevance score below 0.6 to exclude it."""
 
-    # Compile Perplexity results
-    perplexity_text = "\n\n===\n\n".join(
-        [
-            f"Query: {r.query}\n\nAnswer: {r.answer}\n\nSources:\n"
-            + "\n".join([f"- {url}" for url in r.sources])
-            for r in perplexity_results
-        ]
-    )
+    # Compile Perplexity results into one buffer (no per-result intermediate strings).
+    # A URL cited by several queries is only listed under the first one.
+    seen_sources = set()
+    buf = io.StringIO()
+    for i, r in enumerate(perplexity_results):
+        if i:
+            buf.write("\n\n===\n\n")
+        buf.write(f"Query: {r.query}\n\nAnswer: {r.answer}\n\nSources:\n")
+        sources = [u for u in r.sources if u not in seen_sources]
+        seen_sources.update(sources)
+        for j, url in enumerate(sources):
+            buf.write(f"\n- {url}" if j else f"- {url}")
+    perplexity_text = buf.getvalue()
+    recent_titles_text = "".join(f"\n- {title}" for title in recent_titles)
 
     user_prompt = f"""PERPLEXITY SEARCH RESULTS:
 {perplexity_text}
 
 EXISTING NEWS (skip if already covered):
-We already have {len(existing_hashes)} news items in the database from the past 14 days.
+We already have {len(recent_titles)} news items in the database from the past {RECENT_NEWS_DAYS} days{":" if recent_titles else "."}{recent_titles_text}
 
 Extract the best 3-7 news items that are:
 1. Truly newsworthy (not just promotional content)
@@ -178,14 +200,8 @@ Extract the best 3-7 news items that are:
 4. Not duplicates of existing coverage"""
 
     # Use Gemini with structured output
-    from langchain_core.messages import HumanMessage, SystemMessage
-
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
-
-    llm_with_structure = gemini_service.llm.with_structured_output(NewsExtractionOutput)
-
     try:
-        response = llm_with_structure.invoke(messages)
+        response = gemini_service.generate_structured(system_prompt, user_prompt, NewsExtractionOutput)
         # Filter by relevance score
         return [item for item in response.news_items if item.relevance_score >= 0.6]
     except Exception as e:
@@ -206,11 +222,15 @@ def convert_to_news_items(extracted_items: List[ExtractedNewsItem]) -> List[News
     news_items = []
 
     for item in extracted_items:
-        # Parse date if available
+        # Parse date if available (fast path for the documented YYYY-MM-DD)
         published_at = None
         if item.published_date:
+            parts = item.published_date.split("-")
             try:
-                published_at = datetime.fromisoformat(item.published_date)
+                if len(parts) == 3 and all(p.isdigit() for p in parts):
+                    published_at = datetime(int(parts[0]), int(parts[1]), int(parts[2]))
+                else:
+                    published_at = datetime.fromisoformat(item.published_date)
             except ValueError:
                 pass
 
@@ -276,7 +296,12 @@ def main():
             supabase_service = SupabaseService()
             print("✓ Services initialized")
         else:
-            supabase_service = None
+            # Dry runs still read from Supabase (if configured) for duplicate checks
+            try:
+                supabase_service = SupabaseService()
+            except Exception as e:
+                print(f"  Supabase unavailable, skipping duplicate checks: {e}")
+                supabase_service = None
             print("✓ Services initialized (dry run mode)")
     except Exception as e:
         print(f"✗ Error initializing services: {e}")
@@ -290,53 +315,59 @@ def main():
     queries = create_daily_news_queries(recency_filter)
     print(f"Executing {len(queries)} searches...\n")
 
-    # Manually execute searches with custom recency filter
-    perplexity_results = []
-    for i, query in enumerate(queries):
+    # Run all searches in parallel; each one is a few seconds of LLM latency.
+    # Note: We'd need to modify PerplexityService to accept recency_filter
+    # For now, it's hardcoded to "week" in the service
+    def run_search(indexed_query):
+        i, query = indexed_query
         try:
-            print(f"  [{i+1}/{len(queries)}] {query.query[:60]}...")
-            # Note: We'd need to modify PerplexityService to accept recency_filter
-            # For now, it's hardcoded to "week" in the service
             result = perplexity_service.search(query)
-            perplexity_results.append(result)
+            print(f"  [{i+1}/{len(queries)}] {query.query[:60]}...")
+            return result
         except Exception as e:
-            print(f"  ✗ Error: {e}")
+            print(f"  ✗ Error ({query.query[:60]}): {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, len(queries))) as pool:
+        results = list(pool.map(run_search, enumerate(queries)))
+    perplexity_results = [r for r in results if r is not None]
 
     print(f"\n✓ Completed {len(perplexity_results)} searches")
 
-    # Step 2: Get existing hashes for deduplication
-    if not args.dry_run:
-        existing_hashes = supabase_service.get_recent_hashes(days=14)
-        print(f"✓ Found {len(existing_hashes)} existing news items (past 14 days)")
+    # Step 2: Recently stored news, so Gemini can skip stories already covered
+    if supabase_service is not None:
+        recent_news = supabase_service.get_recent_news(
+            limit=RECENT_NEWS_PROMPT_LIMIT, days=RECENT_NEWS_DAYS
+        )
+        recent_titles = [row["title"] for row in recent_news]
+        print(f"✓ Found {len(recent_titles)} existing news items (past {RECENT_NEWS_DAYS} days)")
     else:
-        existing_hashes = []
-        print("✓ Skipping duplicate check (dry run)")
+        recent_titles = []
 
     # Step 3: Extract and deduplicate with Gemini
     print("\n" + "=" * 70)
     print("STEP 2: GEMINI EXTRACTION & DEDUPLICATION")
     print("=" * 70)
 
-    extracted_items = deduplicate_with_gemini(
-        perplexity_results, existing_hashes, gemini_service
-    )
+    extracted_items = deduplicate_with_gemini(perplexity_results, recent_titles, gemini_service)
 
     print(f"\n✓ Extracted {len(extracted_items)} news items")
 
     # Step 4: Convert to NewsItem objects
     news_items = convert_to_news_items(extracted_items)
 
-    # Step 5: Filter out duplicates by hash
-    if not args.dry_run:
-        filtered_items = [
-            item for item in news_items if item.content_hash not in existing_hashes
-        ]
-        print(f"✓ Filtered to {len(filtered_items)} new items (removed duplicates)")
+    # Step 5: Drop already-stored items before the limit, so they don't take
+    # --limit slots only to be skipped by upsert_news_batch's conflict check
+    if supabase_service is not None:
+        existing = supabase_service.get_existing_hashes([item.content_hash for item in news_items])
+        new_items = [item for item in news_items if item.content_hash not in existing]
+        print(f"✓ Filtered to {len(new_items)} new items (removed duplicates)")
     else:
-        filtered_items = news_items
+        new_items = news_items
+        print("✓ Skipping duplicate check (no database connection)")
 
     # Limit to top N by relevance/recency
-    top_items = filtered_items[: args.limit]
+    top_items = new_items[: args.limit]
 
     # Step 6: Display results
     print("\n" + "=" * 70)
@@ -351,13 +382,17 @@ def main():
         print(f"    Featured: {item.is_featured}")
 
     # Step 7: Save to Supabase
+    inserted_count = 0
     if not args.dry_run and top_items:
         print("\n" + "=" * 70)
         print("STEP 3: SAVING TO SUPABASE")
         print("=" * 70)
 
-        inserted_count = supabase_service.insert_many_news(top_items)
+        # One round-trip; the database still skips any hash stored since the check above
+        inserted_count, skipped_hashes = supabase_service.upsert_news_batch(top_items)
         print(f"\n✓ Inserted {inserted_count}/{len(top_items)} items")
+        if skipped_hashes:
+            print(f"  Skipped {len(skipped_hashes)} already-stored items")
     else:
         print("\n✓ Skipping save (dry run mode)")
 
@@ -367,8 +402,8 @@ def main():
     print("=" * 70)
     print(f"Searches: {len(perplexity_results)}")
     print(f"Extracted: {len(extracted_items)}")
-    print(f"New items: {len(filtered_items)}")
-    print(f"Saved: {len(top_items) if not args.dry_run else 0}")
+    print(f"New items: {len(new_items)}")
+    print(f"Saved: {inserted_count}")
     print("=" * 70)
 
 
@@ -20,6 +20,7 @@ Usage:
     python src/scripts/scrape_emails.py --limit 10         # Process max 10 emails
     python src/scripts/scrape_emails.py --days-back 7      # First run: fetch last 7 days
     python src/scripts/scrape_emails.py --query "from:venue@example.com"  # Custom query
+    python src/scripts/scrape_emails.py --gemini-batch     # One Gemini Batch API job (cheaper, slower)
 
 Environment Variables Required:
     SUPABASE_URL, SUPABASE_KEY, GEMINI_API_KEY
@@ -36,13 +37,21 @@ from typing import Optional
 from datetime import datetime, timedelta, timezone
 
 from dotenv import load_dotenv
-from supabase import create_client
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.services.gmail_service import GmailClient
-from src.services.email_processor_service import EmailProcessorService
+from src.services.email_processor_service import EmailProcessorService, EMAIL_BATCH_SIZE
+from src.services.supabase_service import get_supabase_client
+
+# Load environment variables
+load_dotenv()
+
+# Checked once at import (after .env is loaded) rather than on each main() call
+REQUIRED_ENV_VARS = ("SUPABASE_URL", "SUPABASE_KEY", "GEMINI_API_KEY")
+MISSING_ENV_VARS = tuple(var for var in REQUIRED_ENV_VARS if not os.getenv(var))
+TOKEN_PATH = Path("token.json")
 
 
 def main():
@@ -67,24 +76,24 @@ def main():
         help="Force fetch emails from N days back (overrides incremental fetching)",
         default=None
     )
+    parser.add_argument(
+        "--gemini-batch",
+        action="store_true",
+        help="Digest all emails in one Gemini Batch API job (half price, may take minutes)"
+    )
 
     args = parser.parse_args()
 
-    # Load environment variables
-    load_dotenv()
-
     # Verify required env vars
-    required_vars = ["SUPABASE_URL", "SUPABASE_KEY", "GEMINI_API_KEY"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    if missing_vars:
+    if MISSING_ENV_VARS:
         print("ERROR: Missing required environment variables:")
-        for var in missing_vars:
+        for var in MISSING_ENV_VARS:
             print(f"  - {var}")
         print("\nPlease set these in your .env file")
         sys.exit(1)
 
     # Check for token.json
-    token_path = Path("token.json")
+    token_path = TOKEN_PATH
     if not token_path.exists():
         print("ERROR: token.json not found!")
         print("\nRun this command first to generate OAuth token:")
@@ -100,10 +109,7 @@ def main():
     try:
         print("Initializing services...")
         gmail_client = GmailClient(token_path=str(token_path))
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
         processor = EmailProcessorService(
             supabase_client=supabase,
             gemini_api_key=os.getenv("GEMINI_API_KEY")
@@ -147,7 +153,8 @@ def main():
         print("Fetching emails from Gmail...")
         messages = gmail_client.fetch_messages(
             query=gmail_query,
-            max_results=100
+            max_results=100,
+            limit=args.limit or None,
         )
 
         total_fetched = len(messages)
@@ -162,27 +169,33 @@ def main():
         print(f"ERROR: Failed to fetch emails: {e}")
         sys.exit(1)
 
-    # Apply limit if specified
-    if args.limit and args.limit < len(messages):
-        messages = messages[:args.limit]
-        print(f"Processing first {args.limit} emails (--limit flag)")
-        print()
-
     # Process emails
     processed_count = 0
     skipped_count = 0
     sauna_related_count = 0
     errors = []
 
+    # One lookup for the whole run instead of a DB round-trip per email
+    seen_message_ids = processor.get_processed_message_ids(
+        message.get("Message-ID", "") for message in messages
+    )
+
     print("Processing emails...")
     print("-" * 60)
 
+    # Extract bodies first, then compress/classify in batches (one Gemini call per batch)
+    to_process = []
     for i, message in enumerate(messages, 1):
         message_id = message.get("Message-ID", "unknown")
         subject = message.get("Subject", "(no subject)")
 
         print(f"\n[{i}/{len(messages)}] {subject[:50]}...")
 
+        if message_id.strip() in seen_message_ids:
+            print("  ⚠ Skipped (already processed)")
+            skipped_count += 1
+            continue
+
         try:
             # Extract body
             raw_body = gmail_client.get_email_body(message)
@@ -192,9 +205,34 @@ def main():
                 skipped_count += 1
                 continue
 
+            to_process.append((i, message, raw_body))
+
+        except Exception as e:
+            error_msg = f"Email {i}: {str(e)}"
+            errors.append(error_msg)
+            print(f"  ✗ Error: {e}")
+            skipped_count += 1
+
+    if to_process:
+        mode = "one Gemini Batch API job" if args.gemini_batch else f"{EMAIL_BATCH_SIZE} per Gemini call"
+        print(f"\nCompressing + classifying {len(to_process)} emails ({mode})...")
+
+        try:
             # Process and store
-            result = processor.process_email(message, raw_body)
+            results = processor.process_emails_batch(
+                [(message, raw_body) for _, message, raw_body in to_process],
+                batch_size=EMAIL_BATCH_SIZE,
+                use_batch_api=args.gemini_batch
+            )
+        except Exception as e:
+            for i, _, _ in to_process:
+                errors.append(f"Email {i}: {str(e)}")
+            print(f"  ✗ Error: {e}")
+            skipped_count += len(to_process)
+            results = []
 
+        for (i, message, _), result in zip(to_process, results):
+            subject = message.get("Subject", "(no subject)")
             if result:
                 processed_count += 1
                 confidence = result["confidence_score"]
@@ -202,18 +240,12 @@ def main():
 
                 if is_relevant:
                     sauna_related_count += 1
-                    print(f"  ✓ Processed (sauna-related, confidence: {confidence:.2f})")
+                    print(f"  ✓ [{i}] {subject[:40]} (sauna-related, confidence: {confidence:.2f})")
                 else:
-                    print(f"  ✓ Processed (not sauna-related, confidence: {confidence:.2f})")
+                    print(f"  ✓ [{i}] {subject[:40]} (not sauna-related, confidence: {confidence:.2f})")
             else:
                 skipped_count += 1
-                print("  ⚠ Skipped (already processed or error)")
-
-        except Exception as e:
-            error_msg = f"Email {i}: {str(e)}"
-            errors.append(error_msg)
-            print(f"  ✗ Error: {e}")
-            skipped_count += 1
+                print(f"  ⚠ [{i}] {subject[:40]} skipped (already processed or error)")
 
     # Summary
     print()
@@ -6,110 +6,84 @@ Usage:
     python src/scripts/scrape_sauna_news.py
     python src/scripts/scrape_sauna_news.py --out data/scraped/my_news.json
     python src/scripts/scrape_sauna_news.py --recency week
+    python src/scripts/scrape_sauna_news.py --http2
+
+--http2 switches to an httpx HTTP/2 client so all searches multiplex over one
+connection (requires `pip install 'httpx[http2]'`).
 """
 
 import os
 import sys
-import json
 import argparse
 import requests
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.utils.http_retry import request_with_retry, status_retry
+from src.utils.json_output import write_json
+
 
+@dataclass(slots=True, frozen=True)
 class NewsQuery:
     """A news search query."""
-    def __init__(self, query: str, theme: str, context: str):
-        self.query = query
-        self.theme = theme
-        self.context = context
+    query: str
+    theme: str
+    context: str
 
 
+@dataclass(slots=True, frozen=True)
 class NewsResult:
     """Result from a Perplexity news search."""
-    def __init__(self, query: str, theme: str, answer: str, sources: List[str]):
-        self.query = query
-        self.theme = theme
-        self.answer = answer
-        self.sources = sources
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "query": self.query,
-            "theme": self.theme,
-            "answer": self.answer,
-            "sources": self.sources
-        }
-
-
-def create_news_queries() -> List[NewsQuery]:
-    """
-    Create news search queries based on current implementation.
-    Replicates the logic from src/agents/search_agent.py:plan_search_queries
-    """
-    queries = []
-
-    # NEWS THEMES - looking for recently published announcements/news
-    news_themes = [
-        ("openings", "new sauna opening announced London",
-         "Looking for recently published news about openings in London"),
-        ("coming_soon", "sauna coming soon announced London",
-         "Looking for recently published news about coming soon in London"),
-        ("new_location", "sauna expansion new location London",
-         "Looking for recently published news about new location in London"),
-        ("closures", "sauna closed closing London",
-         "Looking for recently published news about closures in London"),
-        ("refurb", "sauna renovation refurbishment London",
-         "Looking for recently published news about refurb in London"),
-        ("general_news", "sauna news announcement London",
-         "Looking for recently published news about london sauna news in London"),
-        ("pop-up", "pop-up sauna temporary sauna London",
-         "Looking for recently published news about pop-up in London"),
-    ]
-
-    for theme, query_text, context in news_themes:
-        queries.append(NewsQuery(query_text, theme, context))
-
+    query: str
+    theme: str
+    answer: str
+    sources: List[str]
+
+
+# NEWS THEMES - looking for recently published announcements/news: (theme, query, context)
+NEWS_THEMES = (
+    ("openings", "new sauna opening announced London",
+     "Looking for recently published news about openings in London"),
+    ("coming_soon", "sauna coming soon announced London",
+     "Looking for recently published news about coming soon in London"),
+    ("new_location", "sauna expansion new location London",
+     "Looking for recently published news about new location in London"),
+    ("closures", "sauna closed closing London",
+     "Looking for recently published news about closures in London"),
+    ("refurb", "sauna renovation refurbishment London",
+     "Looking for recently published news about refurb in London"),
+    ("general_news", "sauna news announcement London",
+     "Looking for recently published news about london sauna news in London"),
+    ("pop-up", "pop-up sauna temporary sauna London",
+     "Looking for recently published news about pop-up in London"),
     # Broader searches for trends/research/culture
-    queries.append(NewsQuery(
-        "sauna health benefits research study",
-        "general_news",
-        "Looking for recent scientific research on sauna health benefits"
-    ))
-
-    queries.append(NewsQuery(
-        "London wellness trends saunas contrast therapy cold plunge",
-        "general_news",
-        "Looking for recent articles about wellness/sauna trends in London"
-    ))
-
-    queries.append(NewsQuery(
-        "sauna culture UK trends communal bathing",
-        "general_news",
-        "Looking for cultural commentary on sauna trends in the UK"
-    ))
-
-    return queries
-
-
-def build_prompt(query: NewsQuery) -> str:
-    """
-    Build an enhanced prompt for Perplexity.
-    Replicates logic from src/services/perplexity_service.py:_build_prompt
-    """
-    prompt_parts = [query.query]
-
-    # Add context
-    if query.context:
-        prompt_parts.append(f"\nContext: {query.context}")
-
-    # Add specific instructions
-    prompt_parts.append("""
+    ("general_news", "sauna health benefits research study",
+     "Looking for recent scientific research on sauna health benefits"),
+    ("general_news", "London wellness trends saunas contrast therapy cold plunge",
+     "Looking for recent articles about wellness/sauna trends in London"),
+    ("general_news", "sauna culture UK trends communal bathing",
+     "Looking for cultural commentary on sauna trends in the UK"),
+)
+
+PROMPT_INSTRUCTIONS = """
 Please provide:
 1. A concise answer (2-4 sentences)
 2. Explicit source URLs (official websites, ticketing links, or reputable sources)
@@ -127,19 +101,75 @@ For news/openings/closures, include:
 - Where (venue/location)
 - When (date or timeframe)
 - Source URL
-""")
+"""
 
-    return "\n".join(prompt_parts)
+# Column names of the results table written by scrape_news (one list per field)
+RESULT_COLUMNS = ("query", "theme", "answer", "sources")
+
+# Query, optional context line, then the fixed instructions
+PROMPT_TEMPLATE = "{query}{context_part}\n" + PROMPT_INSTRUCTIONS
+
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+
+# Status retries (see src.utils.http_retry): fewer and shorter than the scrapers'
+RETRY_TOTAL = 3
+RETRY_BACKOFF_S = 0.5
+
+# Shared keep-alive session: one TLS handshake per pooled connection, not per
+# search, and backoff on rate limits / transient 5xx (POST is opted in)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=len(NEWS_THEMES),
+    max_retries=status_retry(RETRY_TOTAL, RETRY_BACKOFF_S, allowed_methods=("POST",)),
+))
+
+
+def build_http2_client() -> Any:
+    """Create an httpx HTTP/2 client; concurrent searches share one connection."""
+    if httpx is None:
+        raise RuntimeError("--http2 requires httpx. Install: pip install 'httpx[http2]'")
+    return httpx.Client(
+        timeout=30,
+        transport=httpx.HTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=1),
+        ),
+    )
+
+
+def create_news_queries() -> List[NewsQuery]:
+    """
+    Create news search queries based on current implementation.
+    Replicates the logic from src/agents/search_agent.py:plan_search_queries
+    """
+    return [NewsQuery(query_text, theme, context) for theme, query_text, context in NEWS_THEMES]
+
+
+def build_prompt(query: NewsQuery) -> str:
+    """
+    Build an enhanced prompt for Perplexity.
+    Replicates logic from src/services/perplexity_service.py:_build_prompt
+    """
+    return PROMPT_TEMPLATE.format_map({
+        "query": query.query,
+        "context_part": f"\n\nContext: {query.context}" if query.context else "",
+    })
 
 
 def execute_perplexity_search(
     api_key: str,
     query: NewsQuery,
-    recency: str = "month"
+    recency: str = "month",
+    session: Optional[Any] = None,
 ) -> NewsResult:
     """
     Execute a Perplexity search.
     Replicates logic from src/services/perplexity_service.py:search
+
+    Uses the module-level SESSION unless another session (a requests
+    Session or an httpx Client) is passed.
     """
     prompt = build_prompt(query)
 
@@ -165,18 +195,17 @@ def execute_perplexity_search(
         "search_recency_filter": recency
     }
 
-    response = requests.post(
-        "https://api.perplexity.ai/chat/completions",
-        headers=headers,
-        json=payload,
-        timeout=30
+    response = request_with_retry(
+        session or SESSION, "POST", PERPLEXITY_URL, RETRY_TOTAL, RETRY_BACKOFF_S,
+        headers=headers, json=payload, timeout=30,
     )
 
     if response.status_code != 200:
         error_detail = response.text
         raise Exception(f"Perplexity API error ({response.status_code}): {error_detail}")
 
-    result_data = response.json()
+    # orjson parses the ~10 KB answer + citations payload several times faster
+    result_data = orjson.loads(response.content) if orjson is not None else response.json()
 
     # Extract answer and sources
     answer = result_data.get("choices", [{}])[0].get("message", {}).get("content", "")
@@ -186,34 +215,57 @@ def execute_perplexity_search(
         query=query.query,
         theme=query.theme,
         answer=answer,
-        sources=citations
+        # Searches keep citing the same outlets; interning shares one str per URL
+        sources=[sys.intern(c) for c in citations]
     )
 
 
-def scrape_news(api_key: str, recency: str = "month") -> List[NewsResult]:
-    """Execute all news searches."""
+def scrape_news(
+    api_key: str,
+    recency: str = "month",
+    session: Optional[Any] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Execute all news searches concurrently.
+
+    Args:
+        api_key: Perplexity API key
+        recency: Search recency filter
+        session: Client to share across searches (defaults to SESSION)
+
+    Returns:
+        Column-oriented results: {"query": [...], "theme": [...],
+        "answer": [...], "sources": [...]}, row i being the i-th query
+    """
     queries = create_news_queries()
-    results = []
 
     print(f"Executing {len(queries)} news searches...")
     print()
 
-    for i, query in enumerate(queries):
+    def run(indexed_query) -> NewsResult:
+        i, query = indexed_query
         try:
+            result = execute_perplexity_search(api_key, query, recency, session)
             print(f"  [{i+1}/{len(queries)}] {query.query[:60]}...")
-            result = execute_perplexity_search(api_key, query, recency)
-            results.append(result)
+            return result
         except Exception as e:
-            print(f"  ✗ Error: {e}")
+            print(f"  ✗ Error ({query.query[:60]}): {e}")
             # Create empty result on error
-            results.append(NewsResult(
+            return NewsResult(
                 query=query.query,
                 theme=query.theme,
                 answer=f"Error: {str(e)}",
                 sources=[]
-            ))
+            )
+
+    # Searches are independent and latency-bound; the shared client serves all threads
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        results = list(pool.map(run, enumerate(queries)))
 
-    return results
+    return {
+        column: [getattr(r, column) for r in results]
+        for column in RESULT_COLUMNS
+    }
 
 
 def main():
@@ -232,6 +284,11 @@ def main():
         choices=["week", "month"],
         default="month"
     )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use an httpx HTTP/2 client (multiplexes the searches over one connection)"
+    )
 
     args = parser.parse_args()
 
@@ -263,10 +320,15 @@ def main():
     print()
 
     # Execute searches
-    results = scrape_news(api_key, args.recency)
+    if args.http2:
+        with build_http2_client() as client:
+            results = scrape_news(api_key, args.recency, session=client)
+    else:
+        results = scrape_news(api_key, args.recency)
 
     # Count successes
-    successful = sum(1 for r in results if not r.answer.startswith("Error:"))
+    total = len(results["query"])
+    successful = sum(1 for answer in results["answer"] if not answer.startswith("Error:"))
 
     print()
     print("=" * 70)
@@ -275,21 +337,20 @@ def main():
     print(f"Scraped at: {datetime.now().isoformat()}")
     print(f"Recency filter: {args.recency}")
     print()
-    print(f"Searches: {successful}/{len(results)} successful")
+    print(f"Searches: {successful}/{total} successful")
     print()
 
     # Prepare output
     output_data = {
         "scraped_at": datetime.now().isoformat(),
         "recency_filter": args.recency,
-        "total_queries": len(results),
+        "total_queries": total,
         "successful_queries": successful,
-        "results": [r.to_dict() for r in results]
+        "results": results
     }
 
     # Write output
-    with open(output_path, "w") as f:
-        json.dump(output_data, f, indent=2)
+    write_json(output_path, output_data)
 
     print(f"Output written to: {output_path}")
     print("=" * 70)
@@ -14,8 +14,10 @@ Usage:
 import os
 import sys
 from pathlib import Path
+from typing import List
 
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -74,9 +76,18 @@ def test_generate_content(client):
         return False
 
 
-def test_email_compression(client):
-    """Test email compression logic."""
-    print("\nTesting email compression...")
+class EmailAnalysis(BaseModel):
+    """Schema for the combined compression + classification response."""
+
+    bullets: List[str] = Field(description="3-7 concise bullet points of the key content")
+    is_sauna_related: bool = Field(description="Whether the email is sauna/wellness/spa related")
+    confidence: float = Field(description="Confidence 0.0-1.0 in the relevance decision")
+    summary: str = Field(description="One-line summary of the email content")
+
+
+def test_email_analysis(client):
+    """Test email compression and sauna relevance classification in one call."""
+    print("\nTesting email compression + classification...")
 
     sample_email = """
     Dear Customer,
@@ -93,61 +104,19 @@ def test_email_compression(client):
     [Lots of marketing fluff and images here]
     """
 
-    prompt = f"""You are an email content extractor for a London sauna newsletter.
-
-Extract the key points from emails, focusing on:
-- Events (dates, times, locations, names)
-- News and announcements
-- Openings, closures, or changes
-- Special offers or promotions
-
-Remove all:
-- HTML formatting and tags
-- Image references and graphics
-- Excessive whitespace
-- Marketing fluff and boilerplate
-
-Summarize in 3-7 concise bullet points. Be specific about dates, times, and venue names if mentioned.
-
-Email content:
-{sample_email}"""
-
-    try:
-        response = client.models.generate_content(
-            model='gemini-3-flash-preview',
-            contents=prompt
-        )
-        compressed = response.text.strip()
-        print(f"✓ Compressed content:\n{compressed}")
-        return True
-    except Exception as e:
-        print(f"✗ Failed to compress email: {e}")
-        return False
-
-
-def test_classification(client):
-    """Test sauna relevance classification."""
-    print("\nTesting sauna relevance classification...")
-
     test_cases = [
-        ("Sauna event this weekend!", "Join us for a sauna session on Saturday"),
+        ("Sauna event this weekend!", sample_email),
         ("Software update", "Your Adobe subscription is expiring"),
     ]
 
     for subject, content in test_cases:
-        prompt = f"""You are a content classifier for a London sauna newsletter.
-
-Analyze emails to determine if they're related to saunas, wellness, or spa/thermal bathing in London.
-
-Respond in this exact format:
-RELEVANT: yes/no
-CONFIDENCE: 0.0-1.0
-SUMMARY: One-line summary of the email content
+        prompt = f"""You are an email content extractor and classifier for a London sauna newsletter.
 
-Rules:
-- Mark as relevant if it mentions: saunas, spas, thermal bathing, wellness events, bathhouses, steam rooms
-- Mark as NOT relevant if it's: promotions for unrelated businesses, newsletters about other topics
-- Confidence should be high (0.8+) for explicit sauna mentions, medium (0.5-0.7) for general wellness, low (0.3-0.4) for tangential
+Return JSON with:
+- bullets: 3-7 concise bullet points of the key points, focusing on events (dates, times, locations, names), news and announcements, openings, closures, or changes, and special offers. Remove HTML, image references, marketing fluff and boilerplate. Be specific about dates, times, and venue names if mentioned.
+- is_sauna_related: true if it mentions saunas, spas, thermal bathing, wellness events, bathhouses, steam rooms; false for promotions for unrelated businesses or newsletters about other topics
+- confidence: 0.0-1.0; high (0.8+) for explicit sauna mentions, medium (0.5-0.7) for general wellness, low (0.3-0.4) for tangential
+- summary: one-line summary of the email content
 
 Subject: {subject}
 
@@ -157,16 +126,24 @@ Content:
         try:
             response = client.models.generate_content(
                 model='gemini-3-flash-preview',
-                contents=prompt
+                contents=prompt,
+                config={
+                    "response_mime_type": "application/json",
+                    "response_schema": EmailAnalysis,
+                }
             )
-            result = response.text.strip()
+            analysis = EmailAnalysis.model_validate_json(response.text)
             print(f"\nTest case: '{subject}'")
-            print(f"Result:\n{result}")
+            print("Compressed content:")
+            for bullet in analysis.bullets:
+                print(f"  - {bullet}")
+            print(f"Relevant: {analysis.is_sauna_related} (confidence {analysis.confidence:.2f})")
+            print(f"Summary: {analysis.summary}")
         except Exception as e:
-            print(f"✗ Failed classification for '{subject}': {e}")
+            print(f"✗ Failed analysis for '{subject}': {e}")
             return False
 
-    print("\n✓ Classification tests completed")
+    print("\n✓ Email analysis tests completed")
     return True
 
 
@@ -190,12 +167,8 @@ def main():
     if not test_generate_content(client):
         sys.exit(1)
 
-    # Test 4: Email compression
-    if not test_email_compression(client):
-        sys.exit(1)
-
-    # Test 5: Classification
-    if not test_classification(client):
+    # Test 4: Email compression + classification
+    if not test_email_analysis(client):
         sys.exit(1)
 
     print()
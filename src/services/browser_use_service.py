@@ -1,10 +1,14 @@
 """Browser Use integration for event scraping via agentic browser automation."""
 
+import asyncio
 import os
 from typing import List, Optional, Dict, Any
-from browser_use_sdk import BrowserUse
+from browser_use_sdk import AsyncBrowserUse
 from ..models.types import Venue
 
+# Browser Use tasks run remotely; cap how many are in flight at once
+MAX_CONCURRENT_TASKS = 8
+
 
 class BrowserUseService:
     """Service for scraping venue events using Browser Use SDK."""
@@ -20,9 +24,6 @@ class BrowserUseService:
         if not self.api_key:
             raise ValueError("BROWSER_USE_API_KEY not found in environment")
 
-        # Initialize Browser Use client
-        self.client = BrowserUse(api_key=self.api_key)
-
     def scrape_venue_events(
         self,
         venue: Venue,
@@ -31,9 +32,31 @@ class BrowserUseService:
         """
         Scrape events from a venue's website using Browser Use SDK.
 
+        Blocking wrapper around scrape_venue_events_async.
+
+        Args:
+            venue: Venue object with name and URL
+            date_range_description: Human-readable date range (e.g., "next week")
+
+        Returns:
+            Dict with extracted events and metadata
+        """
+        return asyncio.run(self.scrape_venue_events_async(venue, date_range_description))
+
+    async def scrape_venue_events_async(
+        self,
+        venue: Venue,
+        date_range_description: str = "next 7-14 days",
+        aclient: Optional[AsyncBrowserUse] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape events from a venue's website using the async Browser Use client.
+
         Args:
             venue: Venue object with name and URL
             date_range_description: Human-readable date range (e.g., "next week")
+            aclient: Client created on the running event loop (a fresh one is
+                opened and closed here if omitted)
 
         Returns:
             Dict with extracted events and metadata
@@ -64,15 +87,19 @@ Return results as a structured list with event name, date, time, price, and URL
 Venue: {venue.name}
 """
 
+        if aclient is None:
+            async with AsyncBrowserUse(api_key=self.api_key) as aclient:
+                return await self.scrape_venue_events_async(venue, date_range_description, aclient)
+
         try:
             # Create Browser Use task
-            task = self.client.tasks.create_task(
+            task = await aclient.tasks.create_task(
                 task=task_description,
                 llm="browser-use-llm"  # Uses Browser Use's default LLM
             )
 
-            # Execute the task (blocking)
-            result = task.complete()
+            # Wait for the task without blocking other venues
+            result = await task.complete()
 
             return {
                 "venue_name": venue.name,
@@ -95,25 +122,64 @@ Venue: {venue.name}
     def scrape_multiple_venues(
         self,
         venues: List[Venue],
-        date_range_description: str = "next 7-14 days"
+        date_range_description: str = "next 7-14 days",
+        max_workers: int = MAX_CONCURRENT_TASKS
     ) -> List[Dict[str, Any]]:
         """
-        Scrape events from multiple venues sequentially.
+        Scrape events from multiple venues concurrently.
+
+        Blocking wrapper around scrape_multiple_venues_async.
 
         Args:
             venues: List of Venue objects
             date_range_description: Human-readable date range
+            max_workers: Maximum Browser Use tasks in flight at once
 
         Returns:
-            List of results (one per venue)
+            List of results (one per venue, in input order)
+        """
+        return asyncio.run(
+            self.scrape_multiple_venues_async(venues, date_range_description, max_workers)
+        )
+
+    async def scrape_multiple_venues_async(
+        self,
+        venues: List[Venue],
+        date_range_description: str = "next 7-14 days",
+        max_workers: int = MAX_CONCURRENT_TASKS
+    ) -> List[Dict[str, Any]]:
         """
-        results = []
+        Scrape events from multiple venues concurrently on one event loop.
 
-        # Execute sequentially (Browser Use SDK handles tasks synchronously)
-        for i, venue in enumerate(venues, 1):
-            print(f"  [{i}/{len(venues)}] Scraping {venue.name}...")
-            result = self.scrape_venue_events(venue, date_range_description)
-            print(f"      → {'Success' if result['success'] else 'Failed'}")
-            results.append(result)
+        Each venue is an independent remote Browser Use task; a semaphore caps
+        how many are in flight at once.
 
-        return results
+        Args:
+            venues: List of Venue objects
+            date_range_description: Human-readable date range
+            max_workers: Maximum Browser Use tasks in flight at once
+
+        Returns:
+            List of results (one per venue, in input order)
+        """
+        if not venues:
+            return []
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        # One client per event loop: its HTTP connection pool is bound to the
+        # loop it was created on, so it can't be reused across asyncio.run calls
+        async with AsyncBrowserUse(api_key=self.api_key) as aclient:
+
+            async def scrape(i: int, venue: Venue) -> Dict[str, Any]:
+                async with semaphore:
+                    print(f"  [{i}/{len(venues)}] Scraping {venue.name}...")
+                    result = await self.scrape_venue_events_async(
+                        venue, date_range_description, aclient
+                    )
+                print(f"      → {venue.name}: {'Success' if result['success'] else 'Failed'}")
+                return result
+
+            return await asyncio.gather(
+                *(scrape(i, venue) for i, venue in enumerate(venues, 1))
+            )
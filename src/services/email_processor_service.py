@@ -1,22 +1,211 @@
 """Email processing service for compressing and storing emails in Supabase."""
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
 import re
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from email.message import Message
 from email.utils import parseaddr, parsedate_to_datetime
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Callable, Dict, Any, Iterable, List, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+# bs4, google-genai and sentence-transformers are imported where first used:
+# together they cost hundreds of ms at import, which short-lived runs that only
+# query Supabase (e.g. get_latest_email_date from cron) should not pay
+if TYPE_CHECKING:
+    from google import genai
+    from supabase import Client
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# IDs per .in_() lookup in get_processed_message_ids / get_unused_artifacts (keeps the query URL short)
+PROCESSED_ID_CHUNK = 100
+
+# Content hashes per lookup in get_cached_digests (64-char keys, same URL budget)
+DIGEST_CACHE_CHUNK = 50
+
+# Emails compressed + classified per Gemini call in process_emails_batch
+EMAIL_BATCH_SIZE = 10
+
+# Gemini calls in flight at once in digest_emails_concurrently (sized to the RPM quota)
+GEMINI_CONCURRENCY = 5
+
+# Gemini request pacing: default requests/minute (override with env GEMINI_RPM)
+# and the floor RequestPacer backs off to on repeated 429s
+GEMINI_RPM = 30.0
+GEMINI_MIN_RPM = 2.0
+
+# Upper bound on rows per bulk insert statement (stays under PostgREST limits)
+MAX_INSERT_ROWS = 1000
+
+# Cheap relevance prefilter: emails matching none of these skip Gemini entirely.
+# Deliberately broad - a false positive only costs a Gemini call.
+SAUNA_KEYWORDS_RE = re.compile(
+    r"\b(saunas?|spas?|banyas?|thermal|wellness|steam|aufguss|onsen|hammams?|"
+    r"bath(?:s|house|houses|ing)?|plunge|cold[- ]water|contrast therapy|l[öo]yly|sweat)\b",
+    re.I,
+)
+PREFILTER_SCAN_CHARS = 2000
+
+# Optional second prefilter tier, active when sentence-transformers is installed:
+# keyword matches whose embedding is far from the newsletter topic skip Gemini too
+RELEVANCE_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+RELEVANCE_REFERENCE = "London sauna, spa, wellness and thermal bathing events, openings and news"
+RELEVANCE_IRRELEVANT_BELOW = 0.25
+
+# clean_email_body patterns, compiled once. EMAIL_ADDRESS_RE only starts at a
+# token boundary: same matches as \S+@\S+, but linear instead of quadratic
+# on long @-free tokens (tracking strings, encoded blobs)
+URL_RE = re.compile(r'https?://\S+')
+EMAIL_ADDRESS_RE = re.compile(r'(?<!\S)\S+@\S+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+SPACES_RE = re.compile(r' +')
+
+# Server-suggested wait in a Gemini 429 error (e.g. "'retryDelay': '59s'")
+RETRY_DELAY_RE = re.compile(r"'retryDelay': '(\d+)s'")
+
+# Gemini Batch API polling for process_emails_batch(use_batch_api=True)
+BATCH_JOB_POLL_S = 30
+BATCH_JOB_TIMEOUT_S = 3600
+BATCH_JOB_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+})
+
+
+def html_to_text(html: str) -> str:
+    """
+    Extract stripped, newline-separated text nodes from HTML.
+
+    Uses selectolax's lexbor parser when installed, otherwise BeautifulSoup;
+    both skip script/style/comment content and give the same output.
+    """
+    if LexborHTMLParser is None:
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, 'html.parser').get_text(separator='\n', strip=True)
+
+    tree = LexborHTMLParser(html)
+    if tree.root is None:
+        return ""
+    tree.strip_tags(["script", "style"])
+    parts = (
+        node.text_content.strip()
+        for node in tree.root.traverse(include_text=True)
+        if node.tag == "-text"
+    )
+    return "\n".join(part for part in parts if part)
+
+
+@functools.lru_cache(maxsize=1)
+def _relevance_encoder() -> Optional[Tuple[Any, Any]]:
+    """Load the embedding model and normalized reference vector once (None if unavailable)."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    try:
+        model = SentenceTransformer(RELEVANCE_MODEL_NAME)
+    except Exception as e:
+        print(f"Embedding prefilter disabled (could not load {RELEVANCE_MODEL_NAME}): {e}")
+        return None
+    return model, model.encode(RELEVANCE_REFERENCE, normalize_embeddings=True)
+
+
+def topic_similarity(text: str) -> Optional[float]:
+    """
+    Cosine similarity between text and RELEVANCE_REFERENCE.
+
+    Returns:
+        Similarity in [-1, 1], or None when sentence-transformers is unavailable
+    """
+    encoder = _relevance_encoder()
+    if encoder is None:
+        return None
+    model, reference = encoder
+    return float(model.encode(text, normalize_embeddings=True) @ reference)
+
+
+class RequestPacer:
+    """
+    Spaces request start times to a target rate, adapting to rate limits (AIMD).
+
+    Each call reserves the next start slot, so concurrent and sequential callers
+    share one budget. A 429 halves the rate; each success adds 1 RPM back, up
+    to the configured maximum.
+    """
+
+    def __init__(self, rpm: float, min_rpm: float = GEMINI_MIN_RPM):
+        self.max_rpm = rpm
+        self.min_rpm = min(min_rpm, rpm)
+        self.rpm = rpm
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Claim the next start slot; returns seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 60.0 / self.rpm
+            return start - now
+
+    def wait(self) -> None:
+        time.sleep(self._reserve())
+
+    async def wait_async(self) -> None:
+        await asyncio.sleep(self._reserve())
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rpm = min(self.max_rpm, self.rpm + 1)
 
-from supabase import create_client, Client
-from bs4 import BeautifulSoup
-from google import genai
+    def on_rate_limit(self) -> None:
+        with self._lock:
+            self.rpm = max(self.min_rpm, self.rpm / 2)
+
+
+class EmailDigest(BaseModel):
+    """Schema for one email's combined compression + classification result."""
+
+    id: int = Field(description="The id attribute of the <EMAIL> element")
+    compressed: str = Field(description="3-7 concise bullet points of the key content")
+    is_relevant: bool = Field(description="Whether the email is sauna/wellness/spa related")
+    confidence: float = Field(description="Confidence 0.0-1.0 in the relevance decision")
+    summary: str = Field(description="One-line summary of the email content")
+
+
+# Fixed compression + classification instructions. Sent as the system
+# instruction so every digest request starts with the same tokens, which
+# Gemini's implicit prompt caching can reuse across calls.
+DIGEST_INSTRUCTIONS = """You are an email content extractor and classifier for a London sauna newsletter.
+
+For EACH email in the request, return one JSON object with:
+- id: the id attribute of its <EMAIL> element
+- compressed: 3-7 concise bullet points of the key points, focusing on events (dates, times, locations, names), news and announcements, openings, closures, or changes, and special offers. Remove HTML, image references, marketing fluff and boilerplate. Be specific about dates, times, and venue names if mentioned.
+- is_relevant: true if it mentions saunas, spas, thermal bathing, wellness events, bathhouses, steam rooms; false for promotions for unrelated businesses or newsletters about other topics
+- confidence: 0.0-1.0; high (0.8+) for explicit sauna mentions, medium (0.5-0.7) for general wellness, low (0.3-0.4) for tangential
+- summary: one-line summary of the email content"""
+
+# Structured output config shared by the synchronous and Batch API digest calls
+DIGEST_RESPONSE_CONFIG = {
+    "system_instruction": DIGEST_INSTRUCTIONS,
+    "response_mime_type": "application/json",
+    "response_schema": list[EmailDigest],
+}
 
 
 class EmailProcessorService:
     """Service for processing and compressing emails using LLM."""
 
-    def __init__(self, supabase_client: Client, gemini_api_key: str):
+    def __init__(self, supabase_client: "Client", gemini_api_key: str):
         """
         Initialize email processor.
 
@@ -26,64 +215,135 @@ class EmailProcessorService:
         """
         self.supabase = supabase_client
 
-        # Initialize Gemini client (new SDK)
-        self.client = genai.Client(api_key=gemini_api_key)
+        # Gemini client (new SDK) is created on first use, see client
+        self.gemini_api_key = gemini_api_key
         # Use gemini-3-flash-preview
         self.model_name = 'gemini-3-flash-preview'
 
-        # Rate limiting: add delay between API calls to avoid quota exhaustion
-        self.request_delay = 2.0  # 2 seconds between requests to stay under quota
+        # Rate limiting: pace call starts to the quota instead of sleeping after each call
+        self.pacer = RequestPacer(float(os.getenv("GEMINI_RPM", GEMINI_RPM)))
 
-    def _call_gemini_with_retry(self, prompt: str, max_retries: int = 3) -> Optional[str]:
+    @functools.cached_property
+    def client(self) -> "genai.Client":
+        """Gemini client, created (and google-genai imported) on first use."""
+        from google import genai
+        return genai.Client(api_key=self.gemini_api_key)
+
+    @staticmethod
+    def _rate_limit_delay(error: Exception, attempt: int) -> Optional[int]:
+        """
+        Seconds to wait before retrying a rate-limited Gemini call.
+
+        Returns:
+            Delay in seconds, or None if the error is not a 429 rate limit
+        """
+        # google-genai APIError carries the HTTP status; only scan the message
+        # for errors raised without one
+        code = getattr(error, "code", None)
+        if code is not None and code != 429:
+            return None
+
+        error_str = str(error)
+        if code is None and "429" not in error_str and "RESOURCE_EXHAUSTED" not in error_str:
+            return None
+
+        # Extract retry delay from error if available
+        if "retryDelay" in error_str:
+            # Parse retry delay (e.g., "59s")
+            match = RETRY_DELAY_RE.search(error_str)
+            return int(match.group(1)) if match else 60  # Default to 60 seconds
+
+        # Exponential backoff: 5s, 10s, 20s
+        return 5 * (2 ** attempt)
+
+    def _call_gemini_with_retry(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        config: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """
         Call Gemini API with retry logic for rate limiting.
 
         Args:
             prompt: The prompt to send to Gemini
             max_retries: Maximum number of retry attempts
+            config: Optional generation config (e.g. JSON response schema)
 
         Returns:
             Response text or None if all retries failed
         """
         for attempt in range(max_retries):
             try:
+                self.pacer.wait()
                 response = self.client.models.generate_content(
                     model=self.model_name,
-                    contents=prompt
+                    contents=prompt,
+                    config=config
                 )
-                # Success - add delay before next call to stay under quota
-                time.sleep(self.request_delay)
+                self.pacer.on_success()
                 return response.text.strip()
 
             except Exception as e:
-                error_str = str(e)
-
-                # Check if it's a 429 rate limit error
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    # Extract retry delay from error if available
-                    if "retryDelay" in error_str:
-                        # Parse retry delay (e.g., "59s")
-                        import re
-                        match = re.search(r"'retryDelay': '(\d+)s'", error_str)
-                        if match:
-                            retry_delay = int(match.group(1))
-                        else:
-                            retry_delay = 60  # Default to 60 seconds
-                    else:
-                        # Exponential backoff: 5s, 10s, 20s
-                        retry_delay = 5 * (2 ** attempt)
-
-                    if attempt < max_retries - 1:
-                        print(f"  Rate limit hit. Waiting {retry_delay}s before retry {attempt + 1}/{max_retries}...")
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"  Max retries reached. Giving up on this API call.")
-                        return None
-                else:
+                retry_delay = self._rate_limit_delay(e, attempt)
+                if retry_delay is None:
                     # Non-rate-limit error, don't retry
                     print(f"  API error (non-rate-limit): {e}")
                     return None
+                self.pacer.on_rate_limit()
+
+                if attempt < max_retries - 1:
+                    print(f"  Rate limit hit. Waiting {retry_delay}s before retry {attempt + 1}/{max_retries}...")
+                    time.sleep(retry_delay)
+                else:
+                    print(f"  Max retries reached. Giving up on this API call.")
+                    return None
+
+        return None
+
+    async def _call_gemini_with_retry_async(
+        self,
+        aio_client: Any,
+        prompt: str,
+        max_retries: int = 3,
+        config: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Async _call_gemini_with_retry: same retries, but waits with asyncio.sleep.
+
+        Args:
+            aio_client: genai.Client(...).aio for the current event loop
+            prompt: The prompt to send to Gemini
+            max_retries: Maximum number of retry attempts
+            config: Optional generation config (e.g. JSON response schema)
+
+        Returns:
+            Response text or None if all retries failed
+        """
+        for attempt in range(max_retries):
+            try:
+                await self.pacer.wait_async()
+                response = await aio_client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config
+                )
+                self.pacer.on_success()
+                return response.text.strip()
+
+            except Exception as e:
+                retry_delay = self._rate_limit_delay(e, attempt)
+                if retry_delay is None:
+                    print(f"  API error (non-rate-limit): {e}")
+                    return None
+                self.pacer.on_rate_limit()
+
+                if attempt < max_retries - 1:
+                    print(f"  Rate limit hit. Waiting {retry_delay}s before retry {attempt + 1}/{max_retries}...")
+                    await asyncio.sleep(retry_delay)
+                else:
+                    print(f"  Max retries reached. Giving up on this API call.")
+                    return None
 
         return None
 
@@ -98,158 +358,261 @@ class EmailProcessorService:
             True if email exists in database, False otherwise
         """
         try:
+            # HEAD request: PostgREST returns only the count, no row body
             result = (
                 self.supabase.table("emails")
-                .select("id")
+                .select("id", count="exact", head=True)
                 .eq("message_id", message_id)
-                .limit(1)
                 .execute()
             )
-            return bool(result.data)
+            return (result.count or 0) > 0
         except Exception as e:
             print(f"Error checking if email processed: {e}")
             return False
 
-    def clean_email_body(self, raw_body: str) -> str:
+    def get_processed_message_ids(self, message_ids: Iterable[str]) -> Set[str]:
         """
-        Clean email body by removing URLs, excessive whitespace, and formatting.
+        Return which of the given Message-IDs are already stored.
+
+        One query per PROCESSED_ID_CHUNK ids (rather than one per email), so a
+        run can skip duplicates before extracting bodies or calling Gemini.
 
         Args:
-            raw_body: Raw email body text
+            message_ids: Gmail Message-ID headers to check
 
         Returns:
-            Cleaned email body
+            Set of Message-IDs that already exist in the emails table
         """
-        # Remove HTML tags if any remain
-        soup = BeautifulSoup(raw_body, 'html.parser')
-        text = soup.get_text(separator='\n', strip=True)
+        ids = sorted({m.strip() for m in message_ids if m and m.strip()})
+        processed: Set[str] = set()
 
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        for start in range(0, len(ids), PROCESSED_ID_CHUNK):
+            chunk = ids[start:start + PROCESSED_ID_CHUNK]
+            try:
+                result = (
+                    self.supabase.table("emails")
+                    .select("message_id")
+                    .in_("message_id", chunk)
+                    .execute()
+                )
+                processed.update(row["message_id"] for row in result.data or [])
+            except Exception as e:
+                # Missing ids just fall through to the per-email check in process_email
+                print(f"Error fetching processed message IDs: {e}")
 
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        return processed
 
-        # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
+    def digest_cache_key(self, subject: str, raw_body: str) -> str:
+        """
+        Content key for email_llm_cache.
 
-        return text.strip()
+        Hashes the subject and cleaned body; URLs and addresses are stripped,
+        so per-recipient tracking links don't defeat the cache.
+        """
+        content = f"{subject.strip()}\n{self.clean_email_body(raw_body)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-    def compress_email_content(self, raw_body: str) -> str:
+    def get_cached_digests(self, keys: Iterable[str]) -> Dict[str, EmailDigest]:
         """
-        Use Gemini to compress email content into key points.
+        Look up cached Gemini digests by content key.
 
         Args:
-            raw_body: Raw email body text
+            keys: Keys from digest_cache_key
 
         Returns:
-            LLM-compressed content (key points without HTML/graphics)
+            Digests found in email_llm_cache, keyed by content key
         """
-        prompt = f"""You are an email content extractor for a London sauna newsletter.
+        unique_keys = sorted(set(keys))
+        cached: Dict[str, EmailDigest] = {}
 
-Extract the key points from emails, focusing on:
-- Events (dates, times, locations, names)
-- News and announcements
-- Openings, closures, or changes
-- Special offers or promotions
-
-Remove all:
-- HTML formatting and tags
-- Image references and graphics
-- Excessive whitespace
-- Marketing fluff and boilerplate
+        for start in range(0, len(unique_keys), DIGEST_CACHE_CHUNK):
+            chunk = unique_keys[start:start + DIGEST_CACHE_CHUNK]
+            try:
+                result = (
+                    self.supabase.table("email_llm_cache")
+                    .select("*")
+                    .in_("content_hash", chunk)
+                    .execute()
+                )
+            except Exception as e:
+                # A cache miss only costs a Gemini call
+                print(f"Error reading digest cache: {e}")
+                continue
+            for row in result.data or []:
+                cached[row["content_hash"]] = EmailDigest(
+                    id=0,
+                    compressed=row["compressed"],
+                    is_relevant=row["is_sauna_related"],
+                    confidence=row["confidence"] or 0.0,
+                    summary=row["summary"] or ""
+                )
 
-Summarize in 3-7 concise bullet points. Be specific about dates, times, and venue names if mentioned.
+        return cached
 
-Email content:
-{raw_body[:3000]}"""
+    def cache_digests(self, digests: Dict[str, EmailDigest]) -> None:
+        """
+        Store Gemini digests in email_llm_cache (one upsert).
 
+        Args:
+            digests: Digests keyed by content key
+        """
+        if not digests:
+            return
+
+        rows = [
+            {
+                "content_hash": key,
+                "compressed": digest.compressed,
+                "summary": digest.summary,
+                "is_sauna_related": digest.is_relevant,
+                "confidence": digest.confidence,
+                "gemini_model": self.model_name
+            }
+            for key, digest in digests.items()
+        ]
         try:
-            response_text = self._call_gemini_with_retry(prompt)
-            if response_text:
-                return response_text
-            else:
-                # API call failed after retries, use fallback
-                return self.clean_email_body(raw_body)[:500]
+            self.supabase.table("email_llm_cache").upsert(rows, on_conflict="content_hash").execute()
         except Exception as e:
-            print(f"Error compressing email content: {e}")
-            # Fallback: return cleaned body if LLM fails
-            return self.clean_email_body(raw_body)[:500]
+            print(f"Error writing digest cache: {e}")
 
-    def classify_sauna_relevance(self, content: str, subject: str) -> Dict[str, Any]:
+    def _digest_with_cache(
+        self,
+        emails: List[Tuple[str, str]],
+        digest_batch: Callable[[List[Tuple[str, str]]], Dict[int, EmailDigest]]
+    ) -> Dict[int, EmailDigest]:
         """
-        Use Gemini to classify if email is sauna/wellness related and rate confidence.
+        Digest emails, serving repeats from email_llm_cache.
+
+        Only one email per uncached content key is sent to digest_batch;
+        its result is reused for identical emails and written to the cache.
 
         Args:
-            content: Email content (compressed or raw)
-            subject: Email subject line
+            emails: (subject, raw_body) pairs
+            digest_batch: digest_emails_batch or digest_emails_batch_job
 
         Returns:
-            Dict with 'is_sauna_related' (bool), 'confidence_score' (float), and 'summary' (str)
+            Digests keyed by position, like digest_batch
         """
-        prompt = f"""You are a content classifier for a London sauna newsletter.
+        keys = [self.digest_cache_key(subject, raw_body) for subject, raw_body in emails]
+        by_key = self.get_cached_digests(keys)
+        if by_key:
+            print(f"  {sum(key in by_key for key in keys)} email(s) served from digest cache")
+
+        # First position of each content key still missing from the cache
+        misses: Dict[str, int] = {}
+        for position, key in enumerate(keys):
+            if key not in by_key:
+                misses.setdefault(key, position)
+
+        if misses:
+            miss_keys = list(misses)
+            fresh = digest_batch([emails[misses[key]] for key in miss_keys])
+            new_entries = {miss_keys[i]: digest for i, digest in fresh.items()}
+            self.cache_digests(new_entries)
+            by_key.update(new_entries)
+
+        return {
+            position: by_key[key].model_copy(update={"id": position})
+            for position, key in enumerate(keys)
+            if key in by_key
+        }
 
-Analyze emails to determine if they're related to saunas, wellness, or spa/thermal bathing in London.
+    def clean_email_body(self, raw_body: str) -> str:
+        """
+        Clean email body by removing URLs, excessive whitespace, and formatting.
 
-Respond in this exact format:
-RELEVANT: yes/no
-CONFIDENCE: 0.0-1.0
-SUMMARY: One-line summary of the email content
+        Args:
+            raw_body: Raw email body text
 
-Rules:
-- Mark as relevant if it mentions: saunas, spas, thermal bathing, wellness events, bathhouses, steam rooms
-- Mark as NOT relevant if it's: promotions for unrelated businesses, newsletters about other topics
-- Confidence should be high (0.8+) for explicit sauna mentions, medium (0.5-0.7) for general wellness, low (0.3-0.4) for tangential
+        Returns:
+            Cleaned email body
+        """
+        # Remove HTML tags if any remain
+        text = html_to_text(raw_body)
 
-Subject: {subject}
+        # Remove URLs
+        text = URL_RE.sub('', text)
 
-Content:
-{content[:1000]}"""
+        # Remove email addresses
+        text = EMAIL_ADDRESS_RE.sub('', text)
 
-        try:
-            response_text = self._call_gemini_with_retry(prompt)
+        # Remove excessive whitespace
+        text = BLANK_LINES_RE.sub('\n\n', text)
+        text = SPACES_RE.sub(' ', text)
 
-            if not response_text:
-                # API call failed after retries, use conservative fallback
-                return {
-                    "is_sauna_related": True,
-                    "confidence_score": 0.3,
-                    "summary": "Email content (classification failed - rate limit)"
-                }
+        return text.strip()
 
-            # Parse response
-            lines = response_text.split('\n')
-            is_relevant = False
-            confidence = 0.5
-            summary = "Email content"
-
-            for line in lines:
-                if line.startswith("RELEVANT:"):
-                    is_relevant = "yes" in line.lower()
-                elif line.startswith("CONFIDENCE:"):
-                    try:
-                        confidence = float(re.search(r'[\d.]+', line).group())
-                    except:
-                        confidence = 0.5
-                elif line.startswith("SUMMARY:"):
-                    summary = line.replace("SUMMARY:", "").strip()
+    def prefilter_irrelevant(self, subject: str, raw_body: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Keyword (and optional embedding) check that settles clearly off-topic emails without Gemini.
 
-            return {
-                "is_sauna_related": is_relevant,
-                "confidence_score": min(max(confidence, 0.0), 1.0),  # Clamp to [0, 1]
-                "summary": summary
-            }
+        Args:
+            subject: Email subject line
+            raw_body: Plain text email body
 
-        except Exception as e:
-            print(f"Error classifying sauna relevance: {e}")
-            # Conservative fallback: mark as potentially relevant
-            return {
-                "is_sauna_related": True,
-                "confidence_score": 0.3,
-                "summary": "Email content (classification failed)"
+        Returns:
+            (compressed_content, classification) for an email with no sauna
+            keywords in its subject or first PREFILTER_SCAN_CHARS of body, or
+            (with sentence-transformers installed) whose embedding similarity
+            to the newsletter topic is below RELEVANCE_IRRELEVANT_BELOW, else
+            None (the email needs the LLM)
+        """
+        if not (SAUNA_KEYWORDS_RE.search(subject) or SAUNA_KEYWORDS_RE.search(raw_body, 0, PREFILTER_SCAN_CHARS)):
+            return self.clean_email_body(raw_body)[:500], {
+                "is_sauna_related": False,
+                "confidence_score": 0.1,
+                "summary": "Email content (no sauna keywords; not sent to Gemini)"
             }
 
+        if _relevance_encoder() is None:
+            return None
+
+        cleaned = self.clean_email_body(raw_body)[:500]
+        similarity = topic_similarity(f"{subject}\n{cleaned}")
+        if similarity is None or similarity >= RELEVANCE_IRRELEVANT_BELOW:
+            return None
+
+        return cleaned, {
+            "is_sauna_related": False,
+            "confidence_score": round(max(similarity, 0.0), 2),
+            "summary": "Email content (off-topic by embedding similarity; not sent to Gemini)"
+        }
+
+    def compress_and_classify(self, raw_body: str, subject: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Compress an email and classify its sauna relevance with one Gemini call.
+
+        Args:
+            raw_body: Raw email body text
+            subject: Email subject line
+
+        Returns:
+            Tuple of (compressed content, classification dict with
+            'is_sauna_related', 'confidence_score' and 'summary')
+        """
+        digest = self._digest_with_cache([(subject, raw_body)], self.digest_emails_batch).get(0)
+        if digest is not None:
+            return digest.compressed, self._digest_classification(digest)
+
+        return self._unclassified(raw_body)
+
+    def _unclassified(self, raw_body: str) -> Tuple[str, Dict[str, Any]]:
+        """Fallback when Gemini calls failed after retries: cleaned body, conservatively kept."""
+        return self.clean_email_body(raw_body)[:500], {
+            "is_sauna_related": True,
+            "confidence_score": 0.3,
+            "summary": "Email content (classification failed)"
+        }
+
+    @staticmethod
+    def _digest_classification(digest: EmailDigest) -> Dict[str, Any]:
+        """Convert an EmailDigest into the classification dict used for artifacts."""
+        return {
+            "is_sauna_related": digest.is_relevant,
+            "confidence_score": min(max(digest.confidence, 0.0), 1.0),  # Clamp to [0, 1]
+            "summary": digest.summary
+        }
+
     def process_email(self, message: Message, raw_body: str) -> Optional[Dict[str, Any]]:
         """
         Process a single email: extract metadata, compress content, classify, and store.
@@ -272,34 +635,11 @@ Content:
             print(f"Email already processed: {message_id}")
             return None
 
-        # Extract sender info
-        from_header = message.get("From", "")
-        sender_name, sender_email = parseaddr(from_header)
-
-        # Extract subject
-        subject = message.get("Subject", "")
-
-        # Extract date
-        date_header = message.get("Date")
-        email_date = None
-        if date_header:
-            try:
-                email_date = parsedate_to_datetime(date_header)
-            except Exception as e:
-                print(f"Error parsing date: {e}")
+        email_row = self._build_email_row(message, raw_body)
+        subject = email_row["subject"]
 
         # Store raw email
         try:
-            email_row = {
-                "message_id": message_id,
-                "sender": sender_email,
-                "sender_name": sender_name,
-                "subject": subject,
-                "date": email_date.isoformat() if email_date else None,
-                "raw_body": raw_body,
-                "processed_at": datetime.utcnow().isoformat()
-            }
-
             email_result = self.supabase.table("emails").insert(email_row).execute()
             email_id = email_result.data[0]["id"]
 
@@ -307,23 +647,16 @@ Content:
             print(f"Error storing email: {e}")
             return None
 
-        # Compress content
-        compressed_content = self.compress_email_content(raw_body)
-
-        # Classify relevance
-        classification = self.classify_sauna_relevance(compressed_content, subject)
+        prefiltered = self.prefilter_irrelevant(subject, raw_body)
+        if prefiltered:
+            compressed_content, classification = prefiltered
+        else:
+            # Compress and classify in one Gemini call
+            compressed_content, classification = self.compress_and_classify(raw_body, subject)
 
         # Store artifact
         try:
-            artifact_row = {
-                "email_id": email_id,
-                "compressed_content": compressed_content,
-                "summary": classification["summary"],
-                "is_sauna_related": classification["is_sauna_related"],
-                "confidence_score": classification["confidence_score"],
-                "gemini_model": "gemini-2.0-flash-exp",
-                "processed_at": datetime.utcnow().isoformat()
-            }
+            artifact_row = self._build_artifact_row(email_id, email_row, compressed_content, classification)
 
             artifact_result = self.supabase.table("email_artifacts").insert(artifact_row).execute()
             artifact_id = artifact_result.data[0]["id"]
@@ -339,6 +672,339 @@ Content:
             print(f"Error storing artifact: {e}")
             return None
 
+    def _build_email_row(self, message: Message, raw_body: str) -> Dict[str, Any]:
+        """Build the emails table row for a message."""
+        # Extract sender info
+        from_header = message.get("From", "")
+        sender_name, sender_email = parseaddr(from_header)
+
+        # Extract date
+        date_header = message.get("Date")
+        email_date = None
+        if date_header:
+            try:
+                email_date = parsedate_to_datetime(date_header)
+            except Exception as e:
+                print(f"Error parsing date: {e}")
+
+        return {
+            "message_id": message.get("Message-ID", "").strip(),
+            "sender": sender_email,
+            "sender_name": sender_name,
+            "subject": message.get("Subject", ""),
+            "date": email_date.isoformat() if email_date else None,
+            "raw_body": raw_body,
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def _build_artifact_row(
+        self,
+        email_id: str,
+        email_row: Dict[str, Any],
+        compressed_content: str,
+        classification: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the email_artifacts table row for a processed email (see _build_email_row)."""
+        return {
+            "email_id": email_id,
+            # Denormalized from emails so artifact queries need no join (migration 007)
+            "email_date": email_row["date"],
+            "sender": email_row["sender"],
+            "subject": email_row["subject"],
+            "compressed_content": compressed_content,
+            "summary": classification["summary"],
+            "is_sauna_related": classification["is_sauna_related"],
+            "confidence_score": classification["confidence_score"],
+            "gemini_model": "gemini-2.0-flash-exp",
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def _build_digest_prompt(self, emails: List[Tuple[str, str]]) -> str:
+        """Build the per-request contents for digest_emails_batch: just the emails."""
+        blocks = "\n\n".join(
+            f'<EMAIL id="{i}">\nSubject: {subject}\n\n{raw_body[:3000]}\n</EMAIL>'
+            for i, (subject, raw_body) in enumerate(emails)
+        )
+
+        # The instructions travel as the system instruction (DIGEST_RESPONSE_CONFIG)
+        return f"Emails:\n{blocks}"
+
+    @staticmethod
+    def _parse_digests(response_text: str, count: int) -> Dict[int, EmailDigest]:
+        """Parse a digest JSON array, keyed by email position (0 <= id < count)."""
+        try:
+            items = json.loads(response_text)
+            digests = [EmailDigest.model_validate(item) for item in items]
+        except Exception as e:
+            print(f"Error parsing batched Gemini response: {e}")
+            return {}
+
+        return {d.id: d for d in digests if 0 <= d.id < count}
+
+    def digest_emails_batch(self, emails: List[Tuple[str, str]]) -> Dict[int, EmailDigest]:
+        """
+        Compress and classify several emails with a single Gemini call.
+
+        Args:
+            emails: (subject, raw_body) pairs; position i is sent as <EMAIL id="i">
+
+        Returns:
+            Digests keyed by position. Emails Gemini skipped (or a failed call)
+            are simply missing, so callers can fall back to the per-email path.
+        """
+        response_text = self._call_gemini_with_retry(
+            self._build_digest_prompt(emails),
+            config=DIGEST_RESPONSE_CONFIG
+        )
+        if not response_text:
+            return {}
+
+        return self._parse_digests(response_text, len(emails))
+
+    def digest_emails_batch_job(
+        self,
+        emails: List[Tuple[str, str]],
+        poll_interval: float = BATCH_JOB_POLL_S,
+        timeout: float = BATCH_JOB_TIMEOUT_S
+    ) -> Dict[int, EmailDigest]:
+        """
+        Compress and classify emails via one Gemini Batch API job.
+
+        Each email becomes one inlined request. The job is billed at the batch
+        rate and is not subject to the per-call rate limit (so no pacing),
+        but it completes asynchronously: this polls until it finishes or
+        timeout seconds pass.
+
+        Args:
+            emails: (subject, raw_body) pairs
+            poll_interval: Seconds between job status checks
+            timeout: Give up (and cancel the job) after this many seconds
+
+        Returns:
+            Digests keyed by position, like digest_emails_batch. Failed
+            requests, or the whole job failing, leave entries missing.
+        """
+        if not emails:
+            return {}
+
+        try:
+            job = self.client.batches.create(
+                model=self.model_name,
+                src=[
+                    {
+                        "contents": self._build_digest_prompt([email]),
+                        "config": DIGEST_RESPONSE_CONFIG,
+                    }
+                    for email in emails
+                ],
+                config={"display_name": f"email-digest-{datetime.now(timezone.utc):%Y%m%d%H%M%S}"}
+            )
+
+            deadline = time.monotonic() + timeout
+            while job.state.name not in BATCH_JOB_DONE_STATES:
+                if time.monotonic() > deadline:
+                    print(f"  Batch job {job.name} still {job.state.name} after {timeout:.0f}s, cancelling")
+                    self.client.batches.cancel(name=job.name)
+                    return {}
+                time.sleep(poll_interval)
+                job = self.client.batches.get(name=job.name)
+        except Exception as e:
+            print(f"  Batch API error: {e}")
+            return {}
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            print(f"  Batch job {job.name} ended as {job.state.name}: {job.error}")
+            return {}
+
+        digests = {}
+        for i, inlined in enumerate(job.dest.inlined_responses or []):
+            if inlined.error or not inlined.response or not inlined.response.text:
+                continue
+            digest = self._parse_digests(inlined.response.text, 1).get(0)
+            if digest is not None:
+                digests[i] = digest.model_copy(update={"id": i})
+        return digests
+
+    def digest_emails_concurrently(
+        self,
+        emails: List[Tuple[str, str]],
+        batch_size: int = EMAIL_BATCH_SIZE
+    ) -> Dict[int, EmailDigest]:
+        """
+        Digest emails in batch_size groups with up to GEMINI_CONCURRENCY calls in flight.
+
+        Args:
+            emails: (subject, raw_body) pairs
+            batch_size: Emails per Gemini call
+
+        Returns:
+            Digests keyed by position, like digest_emails_batch
+        """
+        return asyncio.run(self._digest_emails_concurrently_async(emails, batch_size))
+
+    async def _digest_emails_concurrently_async(
+        self,
+        emails: List[Tuple[str, str]],
+        batch_size: int
+    ) -> Dict[int, EmailDigest]:
+        from google import genai
+
+        # Fresh client per event loop: the async transport is bound to the loop it runs on
+        aio_client = genai.Client(api_key=self.gemini_api_key).aio
+        semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+        async def digest_group(start: int) -> Dict[int, EmailDigest]:
+            group = emails[start:start + batch_size]
+            async with semaphore:
+                response_text = await self._call_gemini_with_retry_async(
+                    aio_client,
+                    self._build_digest_prompt(group),
+                    config=DIGEST_RESPONSE_CONFIG
+                )
+            if not response_text:
+                return {}
+            return {start + i: d for i, d in self._parse_digests(response_text, len(group)).items()}
+
+        digests: Dict[int, EmailDigest] = {}
+        for group_digests in await asyncio.gather(
+            *(digest_group(start) for start in range(0, len(emails), batch_size))
+        ):
+            digests.update(group_digests)
+        return digests
+
+    def process_emails_batch(
+        self,
+        items: List[Tuple[Message, str]],
+        batch_size: int = EMAIL_BATCH_SIZE,
+        use_batch_api: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process emails in bulk: batched Gemini calls, then two bulk inserts per chunk.
+
+        Every email that still needs Gemini is digested first, in one go
+        (batch_size emails per call, calls run concurrently). Only then are the
+        raw emails and their artifacts stored, chunk by chunk, so an email row
+        never outlives a run without its artifact: get_processed_message_ids
+        would skip it on every later run.
+
+        Same result shape as process_email, which is used as the fallback for a
+        chunk whose bulk email insert fails.
+
+        Args:
+            items: (message, raw_body) pairs
+            batch_size: Emails per Gemini call and per insert chunk, capped
+                at MAX_INSERT_ROWS so each chunk is one insert per table
+            use_batch_api: Digest with one Gemini Batch API job instead of
+                synchronous calls (cheaper, but asynchronous)
+
+        Returns:
+            One result (or None if skipped/failed) per input item, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        batch_size = min(batch_size, MAX_INSERT_ROWS)
+
+        # Pick out new emails: (pending, email_rows, prefiltered) per chunk
+        chunks = []
+        for start in range(0, len(items), batch_size):
+            chunk = list(enumerate(items[start:start + batch_size], start))
+
+            # Same skips as process_email, with one lookup for the whole chunk
+            processed = self.get_processed_message_ids(
+                message.get("Message-ID", "") for _, (message, _) in chunk
+            )
+            pending = []
+            for index, (message, raw_body) in chunk:
+                message_id = message.get("Message-ID", "").strip()
+                if not message_id:
+                    print("Skipping email without Message-ID")
+                elif message_id in processed:
+                    print(f"Email already processed: {message_id}")
+                else:
+                    pending.append((index, message, raw_body))
+            if not pending:
+                continue
+
+            email_rows = [self._build_email_row(message, raw_body) for _, message, raw_body in pending]
+
+            # Only emails that pass the keyword prefilter go to Gemini
+            prefiltered = [
+                self.prefilter_irrelevant(row["subject"], raw_body)
+                for row, (_, _, raw_body) in zip(email_rows, pending)
+            ]
+            chunks.append((pending, email_rows, prefiltered))
+
+        # Digest everything that needs Gemini across all chunks at once
+        needs_llm = [
+            (chunk_no, position)
+            for chunk_no, (_, _, prefiltered) in enumerate(chunks)
+            for position, result in enumerate(prefiltered)
+            if result is None
+        ]
+        digests = {}
+        concurrent_batch = functools.partial(self.digest_emails_concurrently, batch_size=batch_size)
+        first_pass = self.digest_emails_batch_job if use_batch_api else concurrent_batch
+        # The second pass retries whatever the first skipped (or all of it, if a
+        # batch job failed or timed out) with concurrent synchronous calls
+        for digest_batch in (first_pass, concurrent_batch):
+            missing = [key for key in needs_llm if key not in digests]
+            if not missing:
+                break
+            batch_digests = self._digest_with_cache(
+                [
+                    (chunks[chunk_no][1][position]["subject"], chunks[chunk_no][0][position][2])
+                    for chunk_no, position in missing
+                ],
+                digest_batch
+            )
+            digests.update((missing[i], digest) for i, digest in batch_digests.items())
+
+        # Store raw emails and their artifacts, one insert per table per chunk
+        for chunk_no, (pending, email_rows, prefiltered) in enumerate(chunks):
+            try:
+                email_result = self.supabase.table("emails").insert(email_rows).execute()
+                email_ids = [row["id"] for row in email_result.data]
+            except Exception as e:
+                print(f"Error storing email batch, processing one by one: {e}")
+                for index, message, raw_body in pending:
+                    results[index] = self.process_email(message, raw_body)
+                continue
+
+            artifact_rows = []
+            for position, ((_, _, raw_body), row, email_id) in enumerate(zip(pending, email_rows, email_ids)):
+                digest = digests.get((chunk_no, position))
+                if prefiltered[position] is not None:
+                    compressed_content, classification = prefiltered[position]
+                elif digest is not None:
+                    compressed_content = digest.compressed
+                    classification = self._digest_classification(digest)
+                else:
+                    compressed_content, classification = self._unclassified(raw_body)
+                artifact_rows.append(self._build_artifact_row(email_id, row, compressed_content, classification))
+
+            try:
+                artifact_result = self.supabase.table("email_artifacts").insert(artifact_rows).execute()
+            except Exception as e:
+                print(f"Error storing artifact batch: {e}")
+                self._discard_emails(email_ids)
+                continue
+
+            for (index, _, _), artifact in zip(pending, artifact_result.data):
+                results[index] = {
+                    "email_id": artifact["email_id"],
+                    "artifact_id": artifact["id"],
+                    "is_sauna_related": artifact["is_sauna_related"],
+                    "confidence_score": artifact["confidence_score"]
+                }
+
+        return results
+
+    def _discard_emails(self, email_ids: List[str]) -> None:
+        """Delete email rows whose artifacts could not be stored, so the next run retries them."""
+        try:
+            self.supabase.table("emails").delete().in_("id", email_ids).execute()
+        except Exception as e:
+            print(f"Error removing emails without artifacts: {e}")
+
     def get_latest_email_date(self) -> Optional[str]:
         """
         Get the date of the most recent email in our database.
@@ -354,6 +1020,7 @@ Content:
             result = (
                 self.supabase.table("emails")
                 .select("date")
+                .not_.is_("date", "null")  # NULLs sort first under DESC
                 .order("date", desc=True)
                 .limit(1)
                 .execute()
@@ -399,7 +1066,7 @@ Content:
             # Get all sauna-related artifacts
             query = (
                 self.supabase.table("email_artifacts")
-                .select("*, emails!inner(date, sender, subject)")
+                .select("*")
                 .eq("is_sauna_related", True)
                 .gte("confidence_score", min_confidence)
             )
@@ -407,25 +1074,23 @@ Content:
             # Add date filter if specified
             if days_back is not None:
                 cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
-                query = query.gte("emails.date", cutoff_date)
+                query = query.gte("email_date", cutoff_date)
 
             artifacts = query.execute()
 
-            # Filter out ones already used
-            unused = []
-            for artifact in artifacts.data or []:
+            # Filter out ones already used (one lookup per PROCESSED_ID_CHUNK ids)
+            artifact_ids = [artifact["id"] for artifact in artifacts.data or []]
+            used_ids = set()
+            for start in range(0, len(artifact_ids), PROCESSED_ID_CHUNK):
                 used_check = (
                     self.supabase.table("newsletter_artifacts")
                     .select("artifact_id")
-                    .eq("artifact_id", artifact["id"])
-                    .limit(1)
+                    .in_("artifact_id", artifact_ids[start:start + PROCESSED_ID_CHUNK])
                     .execute()
                 )
+                used_ids.update(row["artifact_id"] for row in used_check.data or [])
 
-                if not used_check.data:
-                    unused.append(artifact)
-
-            return unused
+            return [artifact for artifact in artifacts.data or [] if artifact["id"] not in used_ids]
 
     def mark_artifacts_used(self, artifact_ids: list, run_id: str) -> None:
         """
@@ -436,11 +1101,12 @@ Content:
             run_id: Newsletter run ID
         """
         try:
+            now = datetime.now(timezone.utc).isoformat()
             rows = [
                 {
                     "artifact_id": artifact_id,
                     "run_id": run_id,
-                    "created_at": datetime.utcnow().isoformat()
+                    "created_at": now
                 }
                 for artifact_id in artifact_ids
             ]
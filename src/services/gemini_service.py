@@ -3,11 +3,11 @@
 NOTE: Drafting, critique, and revision are now handled by Claude SDK in draft_tools.py
 """
 
+import io
 import os
-from typing import List, Optional
+from typing import List, Optional, Type, TypeVar
 from pydantic import BaseModel, Field
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from google import genai
 from ..models.types import PerplexityResult, BrowserUseResult, Candidate, CandidateType
 
 
@@ -36,6 +36,14 @@ class ShortlistOutput(BaseModel):
     selected_indices: List[int] = Field(description="Indices of selected candidates (0-based)")
 
 
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Scraped events per venue, and total characters of the scraped-events prompt
+# section (~4 chars/token, so ~15k tokens); venues past the budget are dropped
+MAX_EVENTS_PER_VENUE = 20
+MAX_SCRAPED_EVENTS_CHARS = 60_000
+
+
 class GeminiService:
     """Service for interacting with Gemini Flash for deduplication and selection tasks only."""
 
@@ -51,11 +59,46 @@ class GeminiService:
             raise ValueError("GEMINI_API_KEY not found")
 
         # Use Gemini 3 Flash Preview for deduplication and extraction
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-3-flash-preview",
-            google_api_key=self.api_key,
-            temperature=0.1
+        self.client = genai.Client(api_key=self.api_key)
+        self.model_name = "gemini-3-flash-preview"
+        self.temperature = 0.1
+
+    def generate_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Type[SchemaT]
+    ) -> SchemaT:
+        """
+        Run one Gemini call whose JSON output is constrained to a Pydantic schema.
+
+        google-genai enforces the schema server-side and validates the reply
+        into the model, so there is no parse-failure retry round-trip.
+
+        Args:
+            system_prompt: System instruction
+            user_prompt: User message
+            schema: Pydantic model the response must match
+
+        Returns:
+            Validated schema instance
+
+        Raises:
+            ValueError: If the response could not be parsed into the schema
+        """
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=user_prompt,
+            config={
+                "system_instruction": system_prompt,
+                "temperature": self.temperature,
+                "response_mime_type": "application/json",
+                "response_schema": schema,
+            }
         )
+        if not isinstance(response.parsed, schema):
+            raise ValueError(f"Gemini response did not match {schema.__name__}: {response.text!r:.200}")
+        return response.parsed
 
     def deduplicate_and_extract_candidates(
         self,
@@ -136,24 +179,7 @@ Return a list of candidate objects with:
             for r in perplexity_results
         ])
 
-        # Compile scraped events with better formatting
-        scraped_sections = []
-        for r in browser_use_results:
-            if r.success and r.events:
-                events_list = "\n".join([
-                    f"  - {event.get('event_name', 'Unknown')} on {event.get('date', 'TBD')} at {event.get('start_datetime', 'TBD')}"
-                    + (f" (URL: {event.get('source_url', 'N/A')})" if event.get('source_url') else "")
-                    for event in r.events[:20]  # Limit to 20 events per venue to avoid token explosion
-                ])
-                scraped_sections.append(
-                    f"Venue: {r.venue_name}\nVenue URL: {r.venue_url}\n\nEvents ({len(r.events)} total):\n{events_list}"
-                )
-            else:
-                scraped_sections.append(
-                    f"Venue: {r.venue_name}\nVenue URL: {r.venue_url}\nError: {r.error or 'No events found'}"
-                )
-
-        scraped_events_text = "\n\n---\n\n".join(scraped_sections)
+        scraped_events_text = self._format_scraped_events(browser_use_results)
 
         # Compile email candidates
         email_candidates = email_candidates or []
@@ -182,16 +208,8 @@ Return a list of candidate objects with:
 
 Extract all relevant candidates. Remember to align with the newsletter structure: prioritize venue changes for "The Moves", notable events for "The Rankings", and time-specific opportunities for "Weekend Windows"."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
-
-        # Use structured output
-        llm_with_structure = self.llm.with_structured_output(CandidatesListOutput)
-
         try:
-            response = llm_with_structure.invoke(messages)
+            response = self.generate_structured(system_prompt, user_prompt, CandidatesListOutput)
 
             # Convert to Candidate objects
             candidates = []
@@ -220,6 +238,49 @@ Extract all relevant candidates. Remember to align with the newsletter structure
             print(f"Error calling Gemini for deduplication: {e}")
             return []
 
+    @staticmethod
+    def _format_scraped_events(browser_use_results: List[BrowserUseResult]) -> str:
+        """
+        Render scraped venue events for the deduplication prompt in one buffer.
+
+        Venues that failed to scrape (or returned no events) go after those with
+        events, and venues that would push the text past MAX_SCRAPED_EVENTS_CHARS
+        are dropped: the model ignores most of an oversized prompt anyway.
+
+        Args:
+            browser_use_results: List of Browser Use scraping results
+
+        Returns:
+            Prompt section text
+        """
+        ordered = sorted(browser_use_results, key=lambda r: not (r.success and r.events))
+
+        buf = io.StringIO()
+        for i, r in enumerate(ordered):
+            start = buf.tell()
+            if i:
+                buf.write("\n\n---\n\n")
+            buf.write(f"Venue: {r.venue_name}\nVenue URL: {r.venue_url}\n")
+            if r.success and r.events:
+                buf.write(f"\nEvents ({len(r.events)} total):")
+                for event in r.events[:MAX_EVENTS_PER_VENUE]:
+                    buf.write(
+                        f"\n  - {event.get('event_name', 'Unknown')} on {event.get('date', 'TBD')}"
+                        f" at {event.get('start_datetime', 'TBD')}"
+                    )
+                    if event.get('source_url'):
+                        buf.write(f" (URL: {event['source_url']})")
+            else:
+                buf.write(f"Error: {r.error or 'No events found'}")
+
+            if buf.tell() > MAX_SCRAPED_EVENTS_CHARS and i:
+                buf.seek(start)
+                buf.truncate()
+                buf.write(f"\n\n---\n\n({len(ordered) - i} more venues omitted to fit the prompt budget)")
+                break
+
+        return buf.getvalue()
+
     def select_shortlist(
         self,
         candidates: List[Candidate],
@@ -274,16 +335,8 @@ PREVIOUS ISSUES (for novelty checking):
 
 Select the best ~{target_count} candidates."""
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
-
-        # Use structured output
-        llm_with_structure = self.llm.with_structured_output(ShortlistOutput)
-
         try:
-            response = llm_with_structure.invoke(messages)
+            response = self.generate_structured(system_prompt, user_prompt, ShortlistOutput)
 
             # Return selected candidates
             shortlist = [candidates[i] for i in response.selected_indices if i < len(candidates)]
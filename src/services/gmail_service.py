@@ -2,9 +2,14 @@
 
 import os
 import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from email import message_from_bytes
 from email.message import Message
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 from google.auth.transport.requests import Request
@@ -12,10 +17,35 @@ from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from ..utils.http_retry import RETRY_STATUSES
+
 
 # Gmail API scopes
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# Sub-requests per batch HTTP call (Gmail caps at 100 and rate-limits large batches)
+BATCH_SIZE = 50
+
+# Batch HTTP calls in flight at once in fetch_messages_batch. Kept low: each
+# 50-message batch is already 250 quota units of Gmail's per-user 250/s budget
+FETCH_WORKERS = 4
+
+# Re-sends of a batch's rate-limited (429) / 5xx sub-requests, with exponential backoff
+BATCH_RETRIES = 5
+BATCH_BACKOFF_S = 1.0
+
+# Text parts bigger than this (encoded) are not decoded into the body
+MAX_PART_BYTES = 10 * 1024 * 1024
+
+# Cached credentials are replaced by a background refresh once they are this close to expiry
+REFRESH_AHEAD = timedelta(minutes=5)
+
+# get_credentials cache, keyed by (token_path, scopes); guarded by _CRED_LOCK,
+# which also serializes token.json writes and cache swaps from background refreshes
+_CRED_CACHE: Dict[Tuple[str, Tuple[str, ...]], Credentials] = {}
+_CRED_REFRESHING: Set[Tuple[str, Tuple[str, ...]]] = set()
+_CRED_LOCK = threading.Lock()
+
 
 def load_credentials(token_path: str, scopes: List[str]) -> Credentials:
     """
@@ -49,6 +79,64 @@ def load_credentials(token_path: str, scopes: List[str]) -> Credentials:
     return creds
 
 
+def _refresh_in_background(key: Tuple[str, Tuple[str, ...]], creds: Credentials) -> None:
+    """
+    Refresh a copy of the cached credentials, persist it and swap it into the cache.
+
+    Credentials objects are not thread-safe, and the cached one is in use by
+    the AuthorizedHttp of existing Gmail services, so it is never mutated here.
+    """
+    token_path, scopes = key
+    try:
+        fresh = Credentials.from_authorized_user_info(json.loads(creds.to_json()), list(scopes))
+        fresh.refresh(Request())
+        with _CRED_LOCK:
+            # Write-then-rename: a daemon thread can be killed mid-write at exit
+            tmp_path = f"{token_path}.tmp"
+            with open(tmp_path, 'w') as token_file:
+                token_file.write(fresh.to_json())
+            os.replace(tmp_path, token_path)
+            _CRED_CACHE[key] = fresh
+    except Exception as e:
+        print(f"Background Gmail token refresh failed: {e}")
+    finally:
+        with _CRED_LOCK:
+            _CRED_REFRESHING.discard(key)
+
+
+def get_credentials(token_path: str, scopes: List[str]) -> Credentials:
+    """
+    load_credentials, cached in memory for the life of the process.
+
+    Repeated GmailClient instances share one Credentials object. Once it is
+    within REFRESH_AHEAD of expiry, a daemon thread refreshes a copy (and
+    saves token.json) and swaps it into the cache, while callers keep using
+    the still-valid token, so they never wait on the OAuth round trip.
+    Credentials that are already expired are reloaded and refreshed inline
+    by load_credentials.
+    """
+    key = (token_path, tuple(scopes))
+    with _CRED_LOCK:
+        creds = _CRED_CACHE.get(key)
+
+    if creds is None or not creds.valid:
+        creds = load_credentials(token_path, scopes)  # raises FileNotFoundError
+        with _CRED_LOCK:
+            _CRED_CACHE[key] = creds
+        return creds
+
+    # Credentials.expiry is naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if creds.expiry and creds.refresh_token and creds.expiry - now < REFRESH_AHEAD:
+        with _CRED_LOCK:
+            start_refresh = key not in _CRED_REFRESHING
+            _CRED_REFRESHING.add(key)
+        if start_refresh:
+            threading.Thread(target=_refresh_in_background, args=(key, creds), daemon=True).start()
+
+    return creds
+
+
 class GmailClient:
     """Client for interacting with Gmail API."""
 
@@ -60,23 +148,47 @@ class GmailClient:
             token_path: Path to token.json file (default: "token.json")
         """
         self.token_path = token_path
-        self.creds = load_credentials(self.token_path, SCOPES)
-        self.service = build("gmail", "v1", credentials=self.creds)
+        self.creds = get_credentials(self.token_path, SCOPES)
+        self.service = self._build_service()
+
+        # httplib2 connections are not thread-safe: worker threads in
+        # fetch_messages_batch each get their own service
+        self._local = threading.local()
+        self._local.service = self.service
+
+    def _build_service(self) -> Any:
+        # Use the discovery document bundled with google-api-python-client
+        # instead of fetching it over the network on every run
+        return build(
+            "gmail", "v1",
+            credentials=self.creds,
+            static_discovery=True,
+            cache_discovery=False,
+        )
+
+    def _thread_service(self) -> Any:
+        """Gmail service for the calling thread, built on first use."""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self._build_service()
+        return service
 
     def fetch_messages(
         self,
         query: Optional[str] = None,
-        max_results: int = 100
+        max_results: int = 100,
+        limit: Optional[int] = None,
     ) -> List[Message]:
         """
         Fetch all messages from Gmail matching the optional query.
 
-        Uses pagination to handle large result sets. Fetches full message
-        content including headers and body.
+        Pages through the (metadata-only) message list first, then fetches
+        full message content for all IDs with parallel batch requests.
 
         Args:
             query: Optional Gmail query string (e.g., "after:1234567890", "is:unread")
             max_results: Maximum messages per API call (default: 100)
+            limit: Stop after this many messages in total (default: all)
 
         Returns:
             List of email.message.Message objects
@@ -84,15 +196,18 @@ class GmailClient:
         Raises:
             HttpError: If Gmail API request fails
         """
-        messages: List[Message] = []
+        ids: List[str] = []
         page_token = None
 
         try:
             while True:
                 # Build request parameters
+                page_size = max_results
+                if limit is not None:
+                    page_size = min(max_results, limit - len(ids))
                 list_args = {
                     "userId": "me",
-                    "maxResults": max_results,
+                    "maxResults": page_size,
                 }
                 if query:
                     list_args["q"] = query
@@ -101,38 +216,104 @@ class GmailClient:
 
                 # Fetch message list
                 response = self.service.users().messages().list(**list_args).execute()
-                raw_messages = response.get("messages", [])
-
-                # Fetch full message details
-                for msg_info in raw_messages:
-                    msg_id = msg_info["id"]
-                    detail = self.service.users().messages().get(
-                        userId="me",
-                        id=msg_id,
-                        format="raw"
-                    ).execute()
-
-                    # Decode raw message
-                    msg_bytes = base64.urlsafe_b64decode(detail["raw"])
-                    msg_obj = message_from_bytes(msg_bytes)
-                    messages.append(msg_obj)
+                ids.extend(m["id"] for m in response.get("messages", []))
 
                 # Check for more pages
                 page_token = response.get("nextPageToken")
-                if not page_token:
+                if not page_token or (limit is not None and len(ids) >= limit):
                     break
 
+            # Fetch full message details, batched instead of one call per message
+            details = self.fetch_messages_batch(ids)
+
         except HttpError as error:
             print(f"Gmail API error: {error}")
             raise
 
-        return messages
+        # Decode raw messages
+        return [message_from_bytes(base64.urlsafe_b64decode(detail["raw"])) for detail in details]
+
+    def fetch_messages_batch(self, ids: List[str], format: str = "raw") -> List[Dict[str, Any]]:
+        """
+        Fetch message resources for many IDs using Gmail batch requests.
+
+        Sends BATCH_SIZE messages.get calls per HTTP round trip instead of one
+        each, with up to FETCH_WORKERS batches in flight at once. Sub-requests
+        that fail with 429 or 5xx are re-sent with exponential backoff.
+
+        Args:
+            ids: Gmail message IDs
+            format: Message format to request ("raw", "full", "metadata", ...)
+
+        Returns:
+            Message resources in the same order as ids
+
+        Raises:
+            HttpError: If a message fails with a non-retryable error, or still
+                fails after BATCH_RETRIES retries
+        """
+        chunks = [ids[start:start + BATCH_SIZE] for start in range(0, len(ids), BATCH_SIZE)]
+        if len(chunks) <= 1:
+            return [r for chunk in chunks for r in self._execute_batch(chunk, format)]
+
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(chunks))) as executor:
+            # map yields in submission order and re-raises a worker's HttpError
+            chunk_results = executor.map(lambda chunk: self._execute_batch(chunk, format), chunks)
+            return [r for results in chunk_results for r in results]
+
+    def _execute_batch(self, ids: List[str], format: str) -> List[Dict[str, Any]]:
+        """
+        Fetch up to BATCH_SIZE messages in one batch HTTP request, in order.
+
+        Gmail rejects individual sub-requests with 429 when a batch exceeds the
+        per-user rate, so those (and 5xx) are collected and re-sent in a
+        smaller batch after a backoff instead of failing the whole fetch.
+        """
+        service = self._thread_service()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+        pending = list(range(len(ids)))
+
+        for attempt in range(BATCH_RETRIES + 1):
+            retryable: Dict[int, HttpError] = {}
+            errors: List[Exception] = []
+
+            def on_response(request_id, response, exception):
+                if exception is None:
+                    results[int(request_id)] = response
+                elif isinstance(exception, HttpError) and exception.resp.status in RETRY_STATUSES:
+                    retryable[int(request_id)] = exception
+                else:
+                    errors.append(exception)
+
+            batch = service.new_batch_http_request(callback=on_response)
+            for i in pending:
+                batch.add(
+                    service.users().messages().get(userId="me", id=ids[i], format=format),
+                    request_id=str(i),
+                )
+            batch.execute()
+
+            if errors:
+                raise errors[0]
+            if not retryable:
+                break
+            if attempt == BATCH_RETRIES:
+                raise next(iter(retryable.values()))
+
+            pending = sorted(retryable)
+            time.sleep(BATCH_BACKOFF_S * (2 ** attempt))
+
+        return results
 
     def get_email_body(self, message: Message) -> str:
         """
         Extract plain text body from email message.
 
         Handles multipart messages, HTML conversion, and content decoding.
+        Only text parts are ever decoded: attachments and other MIME parts are
+        skipped without touching their payload, HTML is only parsed when the
+        message has no text/plain part, and any part larger than
+        MAX_PART_BYTES is replaced by a short placeholder.
 
         Args:
             message: email.message.Message object
@@ -140,57 +321,57 @@ class GmailClient:
         Returns:
             Plain text email body
         """
-        body = ""
-
-        # Handle multipart messages
-        if message.is_multipart():
-            for part in message.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-
-                # Skip attachments
-                if "attachment" in content_disposition:
-                    continue
-
-                # Get plain text parts
-                if content_type == "text/plain":
-                    try:
-                        payload = part.get_payload(decode=True)
-                        if payload:
-                            body += payload.decode('utf-8', errors='ignore')
-                    except Exception as e:
-                        print(f"Error decoding text/plain part: {e}")
-
-                # Fallback to HTML if no plain text
-                elif content_type == "text/html" and not body:
-                    try:
-                        payload = part.get_payload(decode=True)
-                        if payload:
-                            html_content = payload.decode('utf-8', errors='ignore')
-                            # Import here to avoid dependency if not needed
-                            from bs4 import BeautifulSoup
-                            soup = BeautifulSoup(html_content, 'html.parser')
-                            body += soup.get_text(separator='\n', strip=True)
-                    except Exception as e:
-                        print(f"Error decoding text/html part: {e}")
-
-        else:
-            # Handle non-multipart messages
-            content_type = message.get_content_type()
-            try:
-                payload = message.get_payload(decode=True)
-                if payload:
-                    if content_type == "text/plain":
-                        body = payload.decode('utf-8', errors='ignore')
-                    elif content_type == "text/html":
-                        from bs4 import BeautifulSoup
-                        html_content = payload.decode('utf-8', errors='ignore')
-                        soup = BeautifulSoup(html_content, 'html.parser')
-                        body = soup.get_text(separator='\n', strip=True)
-            except Exception as e:
-                print(f"Error decoding message body: {e}")
-
-        return body.strip()
+        text_parts: List[str] = []
+        html_part: Optional[Message] = None
+
+        for part in message.walk():
+            if part.is_multipart():
+                continue
+
+            content_type = part.get_content_type()
+            if content_type not in ("text/plain", "text/html"):
+                continue
+
+            # Skip attachments
+            if "attachment" in str(part.get("Content-Disposition", "")):
+                continue
+
+            if content_type == "text/html":
+                # Fallback to HTML only if no plain text; parsed after the walk
+                if html_part is None:
+                    html_part = part
+                continue
+
+            text = self._decode_part(part)
+            if text:
+                text_parts.append(text)
+
+        if not text_parts and html_part is not None:
+            html_content = self._decode_part(html_part)
+            if html_content:
+                try:
+                    # Import here to avoid dependency if not needed
+                    from bs4 import BeautifulSoup
+                    soup = BeautifulSoup(html_content, 'html.parser')
+                    text_parts.append(soup.get_text(separator='\n', strip=True))
+                except Exception as e:
+                    print(f"Error decoding text/html part: {e}")
+
+        return "".join(text_parts).strip()
+
+    @staticmethod
+    def _decode_part(part: Message) -> str:
+        """Decode one leaf MIME part to text, skipping oversized payloads."""
+        encoded = part.get_payload()
+        if isinstance(encoded, str) and len(encoded) > MAX_PART_BYTES:
+            return f"[{part.get_content_type()} part omitted: {len(encoded)} bytes]"
+
+        try:
+            payload = part.get_payload(decode=True)
+        except Exception as e:
+            print(f"Error decoding {part.get_content_type()} part: {e}")
+            return ""
+        return payload.decode('utf-8', errors='ignore') if payload else ""
 
     def get_header(self, message: Message, header_name: str) -> Optional[str]:
         """
@@ -2,7 +2,8 @@
 
 import os
 import hashlib
-from typing import List, Optional, Dict, Any
+import functools
+from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -13,6 +14,38 @@ except ImportError:
     Client = None
 
 
+@functools.lru_cache(maxsize=None)
+def _shared_client(url: str, key: str) -> "Client":
+    return create_client(url, key)
+
+
+def get_supabase_client(url: Optional[str] = None, key: Optional[str] = None) -> "Client":
+    """
+    Return the process-wide Supabase client for a project.
+
+    supabase-py keeps a keep-alive HTTP session per client, so sharing one
+    client lets every service and workflow step reuse its pooled connections
+    instead of paying a new TLS handshake each time a client is created.
+
+    Args:
+        url: Supabase project URL (defaults to env var SUPABASE_URL)
+        key: Supabase service role key (defaults to env var SUPABASE_KEY)
+
+    Returns:
+        Supabase client (one instance per url/key pair)
+    """
+    url = url or os.getenv("SUPABASE_URL")
+    key = key or os.getenv("SUPABASE_KEY")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
+
+    if Client is None:
+        raise ImportError("supabase-py is not installed. Run: pip install supabase")
+
+    return _shared_client(url, key)
+
+
 class NewsItem:
     """Represents a news item."""
 
@@ -70,13 +103,7 @@ class SupabaseService:
         self.url = url or os.getenv("SUPABASE_URL")
         self.key = key or os.getenv("SUPABASE_KEY")
 
-        if not self.url or not self.key:
-            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
-
-        if Client is None:
-            raise ImportError("supabase-py is not installed. Run: pip install supabase")
-
-        self.client: Client = create_client(self.url, self.key)
+        self.client: Client = get_supabase_client(self.url, self.key)
 
     def insert_news(self, news_item: NewsItem) -> Optional[Dict[str, Any]]:
         """
@@ -111,6 +138,34 @@ class SupabaseService:
                 inserted_count += 1
         return inserted_count
 
+    def upsert_news_batch(self, news_items: List[NewsItem]) -> Tuple[int, List[str]]:
+        """
+        Insert news items in a single round-trip via the upsert_news_items RPC.
+
+        Items whose content hash already exists are skipped by the database.
+        Falls back to insert_many_news if the function is not installed
+        (see src/db/migrations/004_upsert_news_items.sql).
+
+        Args:
+            news_items: List of NewsItem objects
+
+        Returns:
+            Tuple of (inserted count, content hashes skipped as duplicates)
+        """
+        if not news_items:
+            return 0, []
+
+        try:
+            result = self.client.rpc(
+                "upsert_news_items",
+                {"items": [item.to_dict() for item in news_items]},
+            ).execute()
+            row = result.data[0] if result.data else {}
+            return row.get("inserted_count", 0), row.get("skipped_hashes") or []
+        except Exception as e:
+            print(f"Error calling upsert_news_items, inserting one by one: {e}")
+            return self.insert_many_news(news_items), []
+
     def check_duplicate(self, content_hash: str) -> bool:
         """
         Check if a news item with the given content hash already exists.
@@ -133,6 +188,31 @@ class SupabaseService:
             print(f"Error checking duplicate: {e}")
             return False
 
+    def get_existing_hashes(self, content_hashes: List[str]) -> Set[str]:
+        """
+        Find which of the given content hashes are already stored, in one query.
+
+        Args:
+            content_hashes: MD5 hashes to check
+
+        Returns:
+            Subset of content_hashes that already exist
+        """
+        if not content_hashes:
+            return set()
+
+        try:
+            result = (
+                self.client.table("sauna_news")
+                .select("content_hash")
+                .in_("content_hash", list(content_hashes))
+                .execute()
+            )
+            return {row["content_hash"] for row in result.data}
+        except Exception as e:
+            print(f"Error checking existing hashes: {e}")
+            return set()
+
     def get_recent_hashes(self, days: int = 14) -> List[str]:
         """
         Get content hashes from the last N days for deduplication.
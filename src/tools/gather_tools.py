@@ -219,25 +219,22 @@ def fetch_email_candidates(min_confidence: float = 0.5, days_back: int = 7) -> D
         }
 
     try:
-        from supabase import create_client
+        from ..services.supabase_service import get_supabase_client
         from ..models.types import Candidate, CandidateType
         from datetime import datetime, timedelta, timezone
 
         # Initialize Supabase client
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
 
         # Fetch artifacts from last N days (regardless of usage status)
         cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
 
         artifacts_response = (
             supabase.table("email_artifacts")
-            .select("*, emails!inner(date, sender, subject)")
+            .select("*")
             .eq("is_sauna_related", True)
             .gte("confidence_score", min_confidence)
-            .gte("emails.date", cutoff_date)
+            .gte("email_date", cutoff_date)
             .order("confidence_score", desc=True)
             .execute()
         )
@@ -115,13 +115,10 @@ def _mark_email_artifacts_used(run_id: str) -> None:
             return
 
         # Mark artifacts as used
-        from supabase import create_client
+        from ..services.supabase_service import get_supabase_client
         from ..services.email_processor_service import EmailProcessorService
 
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
 
         processor = EmailProcessorService(
             supabase_client=supabase,
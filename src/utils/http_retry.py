@@ -0,0 +1,93 @@
+"""Shared status-retry policy for the scrapers' requests sessions and httpx clients."""
+
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Transient statuses worth retrying, and the default attempt count / backoff base
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 6
+RETRY_BACKOFF_S = 0.6
+
+
+def status_retry(
+    total: int = RETRY_TOTAL,
+    backoff_s: float = RETRY_BACKOFF_S,
+    allowed_methods: Iterable[str] = ("GET",),
+) -> Retry:
+    """
+    urllib3 Retry to mount on a requests session (via HTTPAdapter(max_retries=...)).
+
+    Retries connect/read errors and RETRY_STATUSES with exponential backoff,
+    honouring Retry-After, and returns the last response instead of raising.
+    """
+    return Retry(
+        total=total,
+        connect=total,
+        read=total,
+        backoff_factor=backoff_s,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(allowed_methods),
+        raise_on_status=False,
+    )
+
+
+def retry_after_s(response: Any) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header, in delta-seconds or HTTP-date form.
+
+    Returns:
+        Non-negative delay, or None if the header is missing or unparseable
+    """
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def request_with_retry(
+    session: Any,
+    method: str,
+    url: str,
+    total: int = RETRY_TOTAL,
+    backoff_s: float = RETRY_BACKOFF_S,
+    **kwargs: Any,
+) -> Any:
+    """
+    session.request(method, url, **kwargs) under the status_retry policy.
+
+    A requests session is called once: its mounted status_retry already
+    retries. httpx transports only retry connection errors, so for an
+    httpx.Client the RETRY_STATUSES retries (Retry-After, else exponential
+    backoff) are done here.
+
+    Returns:
+        The final response (possibly still a retryable status)
+    """
+    if httpx is None or not isinstance(session, httpx.Client):
+        return session.request(method, url, **kwargs)
+
+    for attempt in range(total + 1):
+        response = session.request(method, url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == total:
+            break
+        delay = retry_after_s(response)
+        time.sleep(delay if delay is not None else backoff_s * (2 ** attempt))
+    return response
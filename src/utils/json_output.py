@@ -0,0 +1,76 @@
+"""Pretty-printed JSON output for the schedule scrapers."""
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_json(obj: Any) -> bytes:
+    """Encode obj as indented UTF-8 JSON bytes (orjson when installed, else stdlib json)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+@contextlib.contextmanager
+def atomic_output(path: Union[str, Path]) -> Iterator[BinaryIO]:
+    """
+    Open a temp file next to path for writing; it replaces path only on success.
+
+    If the block raises (e.g. a lazily fetched page fails mid-write), the temp
+    file is removed and any previous output at path is left untouched.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json(path: Union[str, Path], payload: Any) -> None:
+    """
+    Write payload to path as one pretty-printed JSON document.
+
+    Args:
+        path: Output file path
+        payload: JSON-serializable object
+    """
+    with atomic_output(path) as f:
+        f.write(encode_json(payload))
+
+
+def write_json_array(path: Union[str, Path], items: Iterable[Dict[str, Any]]) -> int:
+    """
+    Stream items to path as a JSON array, encoding one element at a time.
+
+    The array goes to a temp file that replaces path only once items is
+    exhausted, so an exception raised while iterating leaves path as it was.
+
+    Args:
+        path: Output file path
+        items: JSON-serializable objects (may be a lazy iterator)
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    with atomic_output(path) as f:
+        f.write(b"[")
+        for item in items:
+            f.write(b",\n" if count else b"\n")
+            f.write(encode_json(item))
+            count += 1
+        f.write(b"\n]\n" if count else b"]\n")
+    return count
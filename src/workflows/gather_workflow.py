@@ -95,7 +95,7 @@ def scrape_emails_node(state: GraphState) -> GraphState:
     import os
     from pathlib import Path
     from datetime import datetime, timedelta, timezone
-    from supabase import create_client
+    from ..services.supabase_service import get_supabase_client
     from ..services.gmail_service import GmailClient
     from ..services.email_processor_service import EmailProcessorService
 
@@ -122,10 +122,7 @@ def scrape_emails_node(state: GraphState) -> GraphState:
     try:
         # Initialize services
         gmail_client = GmailClient(token_path=str(token_path))
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
         processor = EmailProcessorService(
             supabase_client=supabase,
             gemini_api_key=os.getenv("GEMINI_API_KEY")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for parsing Gemini's batched email digest responses."""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.email_processor_service import EmailProcessorService
+
+parse_digests = EmailProcessorService._parse_digests
+
+
+def digest(id, summary="Summary"):
+    return {
+        "id": id,
+        "compressed": f"- point for email {id}",
+        "is_relevant": True,
+        "confidence": 0.9,
+        "summary": summary,
+    }
+
+
+def test_keyed_by_id_not_position():
+    """Out-of-order arrays are matched back to emails by their id."""
+    response = json.dumps([digest(2, "third"), digest(0, "first"), digest(1, "second")])
+
+    digests = parse_digests(response, 3)
+
+    assert sorted(digests) == [0, 1, 2]
+    assert [digests[i].summary for i in range(3)] == ["first", "second", "third"]
+
+
+def test_short_array_leaves_missing_emails_out():
+    """Emails Gemini skipped are absent, so callers can fall back for them."""
+    digests = parse_digests(json.dumps([digest(1)]), 3)
+
+    assert list(digests) == [1]
+
+
+def test_out_of_range_ids_are_dropped():
+    digests = parse_digests(json.dumps([digest(0), digest(3), digest(-1)]), 3)
+
+    assert list(digests) == [0]
+
+
+def test_malformed_json_returns_nothing():
+    assert parse_digests('[{"id": 0, "compressed": ', 1) == {}
+    assert parse_digests("not json", 1) == {}
+
+
+def test_schema_mismatch_returns_nothing():
+    """An item missing required fields invalidates the response rather than half-parsing it."""
+    response = json.dumps([digest(0), {"id": 1, "summary": "no other fields"}])
+
+    assert parse_digests(response, 2) == {}
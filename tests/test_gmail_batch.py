@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for GmailClient._execute_batch retries and ordering (no network)."""
+
+import sys
+from pathlib import Path
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services import gmail_service
+from src.services.gmail_service import GmailClient
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class FakeBatch:
+    """Gmail batch request that answers sub-requests in reverse order, like a real batch may."""
+
+    def __init__(self, gmail, callback):
+        self.gmail = gmail
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.gmail.batches.append([message_id for _, message_id in self.requests])
+        for request_id, message_id in reversed(self.requests):
+            self.gmail.calls[message_id] = self.gmail.calls.get(message_id, 0) + 1
+            failures = self.gmail.failures.get(message_id, [])
+            if failures:
+                self.callback(request_id, None, http_error(failures.pop(0)))
+            else:
+                self.callback(request_id, {"id": message_id}, None)
+
+
+class FakeGmail:
+    """Just enough of the Gmail discovery service for _execute_batch."""
+
+    def __init__(self, failures=None):
+        # message id -> statuses returned on successive attempts before succeeding
+        self.failures = failures or {}
+        self.calls = {}
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, format):
+        return id
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(gmail_service.time, "sleep", waits.append)
+    return waits
+
+
+def client_for(gmail):
+    client = GmailClient.__new__(GmailClient)
+    client._thread_service = lambda: gmail
+    return client
+
+
+def test_results_follow_input_order(sleeps):
+    gmail = FakeGmail()
+    results = client_for(gmail)._execute_batch(["a", "b", "c"], "raw")
+
+    assert results == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    assert sleeps == []
+
+
+def test_rate_limited_and_5xx_sub_requests_are_resent(sleeps):
+    gmail = FakeGmail({"b": [429, 429], "c": [503]})
+    results = client_for(gmail)._execute_batch(["a", "b", "c"], "raw")
+
+    assert results == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    # Only the failed sub-requests are re-sent, with exponential backoff
+    assert gmail.batches == [["a", "b", "c"], ["b", "c"], ["b"]]
+    assert sleeps == [gmail_service.BATCH_BACKOFF_S, 2 * gmail_service.BATCH_BACKOFF_S]
+
+
+def test_non_retryable_error_raises_without_retry(sleeps):
+    gmail = FakeGmail({"b": [404]})
+
+    with pytest.raises(HttpError) as excinfo:
+        client_for(gmail)._execute_batch(["a", "b"], "raw")
+
+    assert excinfo.value.resp.status == 404
+    assert len(gmail.batches) == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_batch_retries(sleeps):
+    gmail = FakeGmail({"a": [429] * (gmail_service.BATCH_RETRIES + 1)})
+
+    with pytest.raises(HttpError) as excinfo:
+        client_for(gmail)._execute_batch(["a"], "raw")
+
+    assert excinfo.value.resp.status == 429
+    assert gmail.calls["a"] == gmail_service.BATCH_RETRIES + 1
+    assert len(sleeps) == gmail_service.BATCH_RETRIES
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Tests for Retry-After parsing in the shared scraper retry helper."""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.http_retry import retry_after_s
+
+
+def response_with(retry_after=None):
+    """Minimal stand-in for a requests/httpx response with an optional Retry-After."""
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return SimpleNamespace(headers=headers)
+
+
+def test_delta_seconds():
+    assert retry_after_s(response_with("7")) == 7.0
+    assert retry_after_s(response_with(" 0 ")) == 0.0
+
+
+def test_http_date_in_the_future():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after_s(response_with(format_datetime(when, usegmt=True)))
+
+    # HTTP-dates have one-second resolution
+    assert delay == pytest.approx(30, abs=2)
+
+
+def test_http_date_in_the_past_is_zero():
+    when = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert retry_after_s(response_with(format_datetime(when, usegmt=True))) == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "-5"])
+def test_missing_or_unparseable(value):
+    assert retry_after_s(response_with(value)) is None
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests for the schedule scrapers' atomic JSON writers."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.json_output import write_json, write_json_array
+
+
+def test_write_json_array_round_trips(tmp_path):
+    """Items streamed from a generator come back as one JSON array."""
+    path = tmp_path / "out.json"
+    items = [{"name": "Aufguss", "price": 12.5}, {"name": "Löyly ☀", "price": None}]
+
+    assert write_json_array(path, (item for item in items)) == 2
+    assert json.loads(path.read_text(encoding="utf-8")) == items
+
+
+def test_write_json_array_empty(tmp_path):
+    """No items still writes a valid (empty) array."""
+    path = tmp_path / "out.json"
+
+    assert write_json_array(path, iter([])) == 0
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_write_json_array_keeps_old_file_when_iterator_raises(tmp_path):
+    """A failure mid-stream leaves the previous output untouched and no temp file behind."""
+    path = tmp_path / "out.json"
+    write_json(path, [{"name": "previous run"}])
+
+    def failing_items():
+        yield {"name": "first"}
+        raise RuntimeError("page fetch failed")
+
+    with pytest.raises(RuntimeError):
+        write_json_array(path, failing_items())
+
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"name": "previous run"}]
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests for pure helpers in the schedule scrapers (no network)."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SCRAPERS_DIR = PROJECT_ROOT / "src" / "scripts" / "scrape-sauna-schedules"
+
+
+def load_scraper(name):
+    """Import a scraper script by path (its directory name is not a valid package name)."""
+    spec = importlib.util.spec_from_file_location(name, SCRAPERS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered before exec so the scripts' dataclasses can resolve their module
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+momence = load_scraper("scrape_momence_schedule_sauna_and_plunge")
+rebase = load_scraper("scrape_rebase_mindbody")
+
+
+@pytest.mark.parametrize("raw, page_size, expected", [
+    ({"totalCount": 0}, 200, 0),
+    ({"totalCount": 200}, 200, 1),
+    ({"totalCount": 201}, 200, 2),
+    ({"total": 450}, 200, 3),
+    ({"pagination": {"total": 5}}, 2, 3),
+    ({"pagination": {"totalCount": 4}}, 2, 2),
+])
+def test_total_pages_from_envelope(raw, page_size, expected):
+    assert momence.total_pages(raw, page_size) == expected
+
+
+@pytest.mark.parametrize("raw, page_size", [
+    ([{"id": 1}], 200),                 # bare list, no envelope
+    ({"payload": []}, 200),             # no total reported
+    ({"totalCount": True}, 200),        # bool is not a count
+    ({"totalCount": "12"}, 200),        # neither is a string
+    ({"totalCount": -1}, 200),
+    ({"pagination": [1, 2]}, 200),
+    ({"totalCount": 10}, 0),            # no sensible page size
+])
+def test_total_pages_unknown(raw, page_size):
+    assert momence.total_pages(raw, page_size) is None
+
+
+def test_unescape_escaped_quotes():
+    escaped = r'{\"class_sessions\":\"<div class=\\\"bw-session\\\">\"}'
+
+    assert rebase._unescape(escaped) == '{"class_sessions":"<div class=\\"bw-session\\">"}'
+
+
+def test_unescape_keeps_non_ascii_text():
+    """Raw non-ASCII must not be mangled (the unicode_escape codec would turn it into mojibake)."""
+    assert rebase._unescape("Löyly \\u2013 Aufguss · £15") == "Löyly – Aufguss · £15"
+
+
+def test_unescape_falls_back_for_js_only_escapes():
+    """\\' and bare quotes are not valid JSON, so the regex pass handles them."""
+    assert rebase._unescape("it\\'s \"late\" \\u003cb\\u003e") == "it's \"late\" <b>"
@@ -118,12 +118,14 @@ def test_gemini():
         service = GeminiService()
 
         # Simple test
-        from langchain_core.messages import HumanMessage
-        response = service.llm.invoke([HumanMessage(content="Say 'OK' if you can read this")])
+        response = service.client.models.generate_content(
+            model=service.model_name,
+            contents="Say 'OK' if you can read this"
+        )
 
-        if response.content:
+        if response.text:
             print(f"  ✓ Gemini API working")
-            print(f"    Response: {response.content[:100]}")
+            print(f"    Response: {response.text[:100]}")
         else:
             print(f"  ✗ Empty response from Gemini")
             return False